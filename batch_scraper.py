@@ -56,8 +56,7 @@ class BatchMediaScraper:
         self.extra_images = extra_images
         self.media_type = media_type
         self.graph_builder = MediaMetadataGraph(self.config, extra_images=extra_images)
-        self.workflow = self.graph_builder.create_graph()
-        self.app = self.workflow.compile()
+        self.app = self.graph_builder.compiled_graph
 
         # Video file extensions
         self.video_extensions = {
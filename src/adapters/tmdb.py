@@ -1,14 +1,20 @@
 import requests
 from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import time
+from ..core.cache import CacheManager
 
 
 class TMDBAdapter:
-    def __init__(self, api_key: str, proxy: Optional[Dict[str, str]] = None, preferred_language: str = "zh-CN"):
+    def __init__(self, api_key: str, proxy: Optional[Dict[str, str]] = None, preferred_language: str = "zh-CN", cache: Optional[CacheManager] = None, cache_ttl_hours: int = 24):
         self.base_url = "https://api.themoviedb.org/3"
         self.api_key = api_key
         self.proxy = proxy
+        # Optional on-disk cache of API responses, keyed by endpoint and params
+        self.cache = cache
+        self.cache_ttl_hours = cache_ttl_hours
         self.preferred_language = preferred_language
         # Set language priority based on preferred language
         if preferred_language == "zh-CN":
@@ -18,24 +24,41 @@ class TMDBAdapter:
         else:  # en-US or other
             self.language_priority = ["en-US", "zh-CN", "zh-TW"]
         self.session = requests.Session()
+        # Up to 3 attempts with jittered exponential backoff on connection errors, timeouts and
+        # transient statuses (honouring Retry-After); client errors such as 404 fail immediately
+        retry = Retry(total=2, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504], respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         if proxy:
             self.session.proxies.update(proxy)
 
-    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make API request with retries and timeout."""
+    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = False) -> Dict[str, Any]:
+        """Make API request with timeout; retries are handled by the session adapter.
+
+        Only callers passing use_cache (image, credit and season listings) read and write the
+        response cache; search results and details are always fetched fresh.
+        """
         url = f"{self.base_url}{endpoint}"
         params = params.copy() if params else {}
+
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = f"tmdb:{endpoint}?{urlencode(sorted(params.items()))}"
+            cached = self.cache.get(cache_key, self.cache_ttl_hours)
+            if cached is not None:
+                return cached
+
         params['api_key'] = self.api_key
 
-        for attempt in range(3):
-            try:
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                return response.json()
-            except requests.RequestException as e:
-                if attempt == 2:
-                    raise e
-                time.sleep(1)
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        if cache_key is not None:
+            self.cache.set(cache_key, data)
+        return data
 
     def get_movie_details(self, tmdb_id: int) -> Dict[str, Any]:
         """Get movie details with language fallback."""
@@ -59,7 +82,7 @@ class TMDBAdapter:
         """Get TV season details with language fallback."""
         for lang in self.language_priority:
             try:
-                return self._make_request(f"/tv/{tmdb_id}/season/{season_number}", {"language": lang})
+                return self._make_request(f"/tv/{tmdb_id}/season/{season_number}", {"language": lang}, use_cache=True)
             except requests.RequestException:
                 continue
         raise Exception(f"Failed to fetch TV season {tmdb_id} season {season_number} in any language")
@@ -83,15 +106,15 @@ class TMDBAdapter:
 
     def get_images(self, media_type: str, tmdb_id: int) -> Dict[str, Any]:
         """Get images for movie or TV show."""
-        return self._make_request(f"/{media_type}/{tmdb_id}/images")
+        return self._make_request(f"/{media_type}/{tmdb_id}/images", use_cache=True)
 
     def get_credits(self, media_type: str, tmdb_id: int) -> Dict[str, Any]:
         """Get credits for movie or TV show."""
-        return self._make_request(f"/{media_type}/{tmdb_id}/credits")
+        return self._make_request(f"/{media_type}/{tmdb_id}/credits", use_cache=True)
 
     def get_tv_episode_images(self, tmdb_id: int, season_number: int, episode_number: int) -> Dict[str, Any]:
         """Get images for a specific TV episode."""
-        return self._make_request(f"/tv/{tmdb_id}/season/{season_number}/episode/{episode_number}/images")
+        return self._make_request(f"/tv/{tmdb_id}/season/{season_number}/episode/{episode_number}/images", use_cache=True)
 
     def find_by_imdb_id(self, imdb_id: str) -> Dict[str, Any]:
         """Find TMDB ID by IMDB ID."""
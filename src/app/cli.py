@@ -148,6 +148,11 @@ def main():
         action="store_true",
         help="Create Extra folder to store additional images (posters, logos, backdrops, fanart). Default: disabled"
     )
+    parser.add_argument(
+        "--skip-existing-images",
+        action="store_true",
+        help="Reuse images already present in the output folder instead of downloading them again. Default: disabled"
+    )
 
     args = parser.parse_args()
 
@@ -172,10 +177,10 @@ def main():
             preferred_language=args.lang,
             verbose=args.verbose,
             quiet=args.quiet,
-            extra_images=args.extra_images
+            extra_images=args.extra_images,
+            skip_existing_images=args.skip_existing_images
         )
-        workflow = graph_builder.create_graph()
-        app = workflow.compile()
+        app = graph_builder.compiled_graph
 
         # Prepare input
         media_type = args.type or "tv"
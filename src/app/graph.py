@@ -1,7 +1,9 @@
 import os
-import shutil
+import re
 import signal
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, Any, List, Optional
 from langgraph.graph import StateGraph, END
 from .state import GraphState
 from ..adapters.tmdb import TMDBAdapter
@@ -12,13 +14,20 @@ from ..core.translator import Translator, TagTranslator
 from ..core.llm_mapper import LLMMapper
 from ..core.artwork import ArtworkDownloader
 from ..core.nfo_renderer import NfoRenderer
+from ..core.schema_nfo import MovieNfo, TvShowNfo
 from ..core.filesystem import FileSystemManager
 from ..core.cache import CacheManager
 from ..core.logger import MetadataLogger
 
+# Number of episode stills fetched from TMDB in parallel
+EPISODE_IMAGE_WORKERS = 8
+
+# Matches episode thumb files ("<title> - S01E02 - <name>-thumb*.jpg") left by earlier runs
+EPISODE_THUMB_PATTERN = re.compile(r' - S(\d{2,})E(\d{2,}) - .*-thumb[^/]*\.jpg$')
+
 
 class MediaMetadataGraph:
-    def __init__(self, config: Dict[str, Any], quiet_google: bool = False, skip_images: bool = False, preferred_language: str = "zh-CN", verbose: bool = False, quiet: bool = False, inplace: bool = False, extra_images: bool = False):
+    def __init__(self, config: Dict[str, Any], quiet_google: bool = False, skip_images: bool = False, preferred_language: str = "zh-CN", verbose: bool = False, quiet: bool = False, inplace: bool = False, extra_images: bool = False, skip_existing_images: bool = False):
         self.config = config
         self.skip_images = skip_images
         self.preferred_language = preferred_language
@@ -33,10 +42,13 @@ class MediaMetadataGraph:
             quiet=quiet
         )
 
+        self.cache = CacheManager()
+
         self.tmdb = TMDBAdapter(
             api_key=config["tmdb"]["api_key"],
             proxy=config.get("proxy"),
-            preferred_language=preferred_language
+            preferred_language=preferred_language,
+            cache=self.cache
         )
         self.omdb = OMDBAdapter(
             api_key=config["omdb"]["api_key"],
@@ -49,17 +61,16 @@ class MediaMetadataGraph:
             search_engine_id=google_config.get("search_engine_id"),
             quiet=quiet_google
         )
-        self.translator = Translator(config["model"])
         self.tag_translator = TagTranslator(config["model"], config.get("proxy"))
+        self.translator = Translator(config["model"], tag_translator=self.tag_translator)
         self.mapper = LLMMapper()  # DirectMapper doesn't need config
-        self.artwork = ArtworkDownloader(config["tmdb"]["api_key"], config.get("proxy"))
-        self.cache = CacheManager()
+        self.artwork = ArtworkDownloader(config["tmdb"]["api_key"], config.get("proxy"), skip_existing=skip_existing_images, cache=self.cache)
 
     def _copy_image_if_missing(self, source_path: str, dest_path: str, image_type: str, source_desc: str, input_data: Dict[str, Any]) -> bool:
         """Copy image if source exists and destination doesn't."""
         if os.path.exists(source_path) and not os.path.exists(dest_path):
             try:
-                shutil.copy2(source_path, dest_path)
+                FileSystemManager.fast_copy(source_path, dest_path)
                 if self._should_print(input_data):
                     print(f"      🔄 {image_type} <- 从{source_desc}复制")
                 return True
@@ -133,6 +144,11 @@ class MediaMetadataGraph:
 
         return workflow
 
+    @cached_property
+    def compiled_graph(self):
+        """Compiled workflow, built once and reused across runs of this instance."""
+        return self.create_graph().compile()
+
     def parse_input_node(self, state: GraphState) -> Dict[str, Any]:
         """Parse input parameters."""
         input_data = state.input
@@ -163,7 +179,8 @@ class MediaMetadataGraph:
         tmdb_id = input_data.get("tmdb_id")
         omdb_id = input_data.get("omdb_id")
 
-        if not query and (tmdb_id or omdb_id):
+        # A direct TMDB ID makes the title search redundant
+        if tmdb_id or (not query and omdb_id):
             self.logger.log_search({}, skip_search=True)
             return {"search": {"results": [], "skip_search": True}}
 
@@ -252,11 +269,8 @@ class MediaMetadataGraph:
             else:
                 raise Exception("Either TMDB ID or OMDB ID is required when query is not provided")
         else:
-            # Simple selection logic - take first result or by ID
-            if input_data.get("tmdb_id"):
-                candidate = next((r for r in search_results if r["id"] == input_data["tmdb_id"]), None)
-            else:
-                candidate = search_results[0] if search_results else None
+            # Simple selection logic - take first result
+            candidate = search_results[0] if search_results else None
 
             # If no candidate found from TMDB search, try Google search if aid_search is enabled
             if not candidate and query and input_data.get("aid_search", False):
@@ -440,17 +454,18 @@ class MediaMetadataGraph:
                         translated_episode = self.translator.translate_metadata(episode_for_translation)
 
                         # Update the episode with translated fields
-                        translated_episode_data = episode.copy()
-                        translated_episode_data["name_zh"] = translated_episode.get("title_zh", episode.get("name", ""))
-                        translated_episode_data["overview_zh"] = translated_episode.get("plot_zh", episode.get("overview", ""))
-
-                        translated_episodes.append(translated_episode_data)
+                        translated_episodes.append({
+                            **episode,
+                            "name_zh": translated_episode.get("title_zh", episode.get("name", "")),
+                            "overview_zh": translated_episode.get("plot_zh", episode.get("overview", "")),
+                        })
                     except Exception:
                         # If translation fails, use original data
-                        translated_episode_data = episode.copy()
-                        translated_episode_data["name_zh"] = episode.get("name", "")
-                        translated_episode_data["overview_zh"] = episode.get("overview", "")
-                        translated_episodes.append(translated_episode_data)
+                        translated_episodes.append({
+                            **episode,
+                            "name_zh": episode.get("name", ""),
+                            "overview_zh": episode.get("overview", ""),
+                        })
             else:
                 # Use original episode data
                 translated_episodes = episodes_data
@@ -663,13 +678,12 @@ class MediaMetadataGraph:
         media_type = normalized.get("media_type")
         tmdb_id = normalized.get("tmdb_id")
 
+        # nfo_data was produced by model_dump() in llm_map_to_nfo_node, so skip re-validation
         if media_type == "movie":
-            from ..core.schema_nfo import MovieNfo
-            nfo_obj = MovieNfo(**nfo_data)
+            nfo_obj = MovieNfo.model_construct(**nfo_data)
             xml_content = NfoRenderer.render_movie_nfo(nfo_obj, tmdb_id)
         else:
-            from ..core.schema_nfo import TvShowNfo
-            nfo_obj = TvShowNfo(**nfo_data)
+            nfo_obj = TvShowNfo.model_construct(**nfo_data)
             xml_content = NfoRenderer.render_tvshow_nfo(nfo_obj, tmdb_id)
 
         # Log NFO generation
@@ -688,8 +702,10 @@ class MediaMetadataGraph:
         title = normalized.get("title", "Unknown")
         year = normalized.get("year", 0)
         output_dir = input_data.get("output_dir", "./output")
+        should_print = self._should_print(input_data)
+        should_print_verbose = self._should_print(input_data, "verbose")
 
-        if self._should_print(input_data):
+        if should_print:
             print("💾 写入输出文件...")
 
         # Create media directory
@@ -702,7 +718,7 @@ class MediaMetadataGraph:
         nfo_filename = f"{title} ({year}).nfo" if media_type == "movie" else "tvshow.nfo"
         nfo_path = FileSystemManager.write_nfo_file(media_dir, nfo_filename, xml_content)
 
-        if self._should_print(input_data):
+        if should_print:
             print(f"   媒体目录: {media_dir}")
             print(f"   NFO 文件: {nfo_path}")
 
@@ -717,7 +733,7 @@ class MediaMetadataGraph:
             episodes_data = source_data.get("translated_episodes", source_data.get("episodes", []))
 
             if seasons_data and episodes_data:
-                if self._should_print(input_data):
+                if should_print:
                     print("📺 处理剧集数据...")
 
                 # Group episodes by season
@@ -728,13 +744,38 @@ class MediaMetadataGraph:
                         episodes_by_season[season_num] = []
                     episodes_by_season[season_num].append(episode)
 
-                # Process each season
+                selected = state.search.get("selected", {})
+                tmdb_id = selected.get("id")
+                image_jobs = []
+
+                # Create every season directory up front, once per season; episodes
+                # are written directly into them (no per-episode directories)
+                season_dirs = {}
+                season_stills = {}
                 for season_data in seasons_data:
                     season_number = season_data.get("season_number", 0)
-                    if season_number <= 0:  # Skip specials
-                        continue
+                    if season_number > 0 and season_number not in season_dirs:  # Skip specials
+                        season_dirs[season_number] = FileSystemManager.create_season_directory(media_dir, season_number)
+                        # fetch_node's season details already carry each episode's primary still;
+                        # episodes without one fall back to the per-episode /images request
+                        season_stills[season_number] = {
+                            episode.get("episode_number", 0): {"stills": [{"file_path": episode["still_path"]}]}
+                            for episode in season_data.get("episodes", [])
+                            if episode.get("still_path")
+                        }
 
-                    season_dir = FileSystemManager.create_season_directory(media_dir, season_number)
+                # Process each season
+                for season_number, season_dir in season_dirs.items():
+                    # Read the season directory once: existing file names for the final status
+                    # report, and old thumb files indexed by episode for cleanup
+                    season_files = set()
+                    existing_thumbs = {}
+                    with os.scandir(season_dir) as entries:
+                        for entry in entries:
+                            season_files.add(entry.name)
+                            match = EPISODE_THUMB_PATTERN.search(entry.name)
+                            if match:
+                                existing_thumbs.setdefault((int(match[1]), int(match[2])), []).append(entry)
 
                     # Process episodes in this season
                     season_episodes = episodes_by_season.get(season_number, [])
@@ -742,11 +783,6 @@ class MediaMetadataGraph:
                         episode_number = episode_data.get("episode_number", 0)
                         episode_title = episode_data.get("name", f"Episode {episode_number}")
 
-                        # Create episode directory and images folder
-                        episode_dir, episode_images_dir = FileSystemManager.create_episode_directory(
-                            season_dir, title, season_number, episode_number, episode_title
-                        )
-
                         # Generate episode NFO content
                         episode_nfo = self.mapper.map_to_episode_nfo(normalized, episode_data, normalized)
                         episode_nfo_content = NfoRenderer.render_episode_nfo(episode_nfo)
@@ -754,141 +790,65 @@ class MediaMetadataGraph:
                             season_dir, title, season_number, episode_number, episode_title, episode_nfo_content
                         )
 
-                        # Download episode-specific images (poster, fanart, thumb)
-                        try:
-                            selected = state.search.get("selected", {})
-                            tmdb_id = selected.get("id")
-                            episode_images_data = self.tmdb.get_tv_episode_images(tmdb_id, season_number, episode_number)
-
-                            if self._should_print(input_data):
-                                print(f"      📸 处理剧集 S{season_number:02d}E{episode_number:02d} 图片...")
-
-                            # Clean episode title for filename
-                            if '/' in episode_title:
-                                safe_episode_title = episode_title.split('/')[0].strip()
-                            else:
-                                safe_episode_title = "".join(c for c in episode_title if c not in '\\:*?"<>|').strip()
-
-                            # Define target filenames (Emby standard)
-                            episode_thumb_filename = f"{title} - S{season_number:02d}E{episode_number:02d} - {safe_episode_title}-thumb.jpg"
-                            episode_fanart_filename = f"{title} - S{season_number:02d}E{episode_number:02d} - {safe_episode_title}-fanart.jpg"
-
-                            episode_thumb_path = os.path.join(season_dir, episode_thumb_filename)
-                            episode_fanart_path = os.path.join(season_dir, episode_fanart_filename)
-
-                            # Remove any existing thumb files for this episode (cleanup from previous runs)
-                            import glob
-                            thumb_pattern = os.path.join(season_dir, f"{title} - S{season_number:02d}E{episode_number:02d} - {safe_episode_title}-thumb*.jpg")
-                            for old_thumb_file in glob.glob(thumb_pattern):
-                                try:
-                                    os.remove(old_thumb_file)
-                                    if self._should_print(input_data, "verbose"):
-                                        print(f"      🗑️  删除旧thumb文件: {os.path.basename(old_thumb_file)}")
-                                except Exception as e:
-                                    if self._should_print(input_data, "verbose"):
-                                        print(f"      ⚠️ 无法删除旧thumb文件 {old_thumb_file}: {e}")
-
-                            # Check available episode images
-                            available_stills = len(episode_images_data.get('stills', []))
-                            if self._should_print(input_data):
-                                print(f"      📊 TMDB提供 {available_stills} 张剧集截图")
-
-                            # Download episode images (Emby standard: -thumb.jpg and -fanart.jpg)
-                            thumb_downloaded = False
-                            fanart_downloaded = False
-                            if episode_images_data.get('stills'):
-                                still = episode_images_data['stills'][0]  # Only download the first still
-                                if still.get('file_path'):
-                                    still_path = still['file_path']
-                                    if not still_path.startswith('/'):
-                                        still_path = '/' + still_path
-                                    still_url = f"https://image.tmdb.org/t/p/original{still_path}"
-
-                                    if self._should_print(input_data):
-                                        print(f"      ⬇️  下载剧集图片: {episode_thumb_filename}")
-                                    # Download as thumb
-                                    if self.artwork.download_image(episode_thumb_path, still_url):
-                                        thumb_downloaded = True
-                                        # Also copy as fanart
-                                        try:
-                                            import shutil
-                                            shutil.copy2(episode_thumb_path, episode_fanart_path)
-                                            fanart_downloaded = True
-                                        except:
-                                            pass
-                                        if self._should_print(input_data):
-                                            print("      ✓ thumb图片下载成功")
-                                    else:
-                                        if self._should_print(input_data):
-                                            print("      ✗ thumb图片下载失败")
-                            else:
-                                if self._should_print(input_data):
-                                    print("      ⚠️ 无可用剧集图片，将尝试复制其他图片")
-
-                            # If thumb still missing, try to copy from main poster
-                            if not thumb_downloaded:
-                                main_poster = os.path.join(media_dir, "poster.jpg")
-                                if os.path.exists(main_poster):
-                                    if self._should_print(input_data):
-                                        print("      📋 thumb缺失，使用主poster...")
-                                    try:
-                                        shutil.copy2(main_poster, episode_thumb_path)
-                                        thumb_downloaded = True
-                                        if self._should_print(input_data):
-                                            print("      ✓ episode thumb从主poster创建成功")
-                                    except Exception as e:
-                                        if self._should_print(input_data):
-                                            print(f"      ⚠️ 主poster复制失败: {e}")
-                                else:
-                                    if self._should_print(input_data):
-                                        print("      ⚠️ 主poster不存在")
-
-                            # If fanart still missing, try to copy from main fanart
-                            if not fanart_downloaded:
-                                main_fanart = os.path.join(media_dir, "fanart.jpg")
-                                if os.path.exists(main_fanart):
-                                    if self._should_print(input_data):
-                                        print("      📋 fanart缺失，使用主fanart...")
-                                    try:
-                                        shutil.copy2(main_fanart, episode_fanart_path)
-                                        fanart_downloaded = True
-                                        if self._should_print(input_data):
-                                            print("      ✓ episode fanart从主fanart创建成功")
-                                    except Exception as e:
-                                        if self._should_print(input_data):
-                                            print(f"      ⚠️ 主fanart复制失败: {e}")
-                                else:
-                                    if self._should_print(input_data):
-                                        print("      ⚠️ 主fanart不存在")
-
-                            # Final status report (thumb and fanart)
-                            thumb_exists = os.path.exists(episode_thumb_path)
-                            fanart_exists = os.path.exists(episode_fanart_path)
-
-                            if self._should_print(input_data):
-                                status_parts = []
-                                if thumb_exists:
-                                    status_parts.append("thumb✓")
-                                else:
-                                    status_parts.append("thumb✗")
-                                if fanart_exists:
-                                    status_parts.append("fanart✓")
-                                else:
-                                    status_parts.append("fanart✗")
-                                print(f"      📊 最终状态: {' | '.join(status_parts)}")
-
-                        except Exception as e:
-                            if self._should_print(input_data, "verbose"):
-                                print(f"      ⚠️ Episode image processing failed: {e}")
-                            pass  # Silent fail for image download
+                        # Clean episode title for filename
+                        safe_episode_title = FileSystemManager.safe_episode_title(episode_title)
+
+                        # Define target filenames (Emby standard)
+                        episode_stem = f"{title} - S{season_number:02d}E{episode_number:02d} - {safe_episode_title}"
+                        episode_thumb_filename = f"{episode_stem}-thumb.jpg"
+                        episode_fanart_filename = f"{episode_stem}-fanart.jpg"
+
+                        # Remove any existing thumb files for this episode (cleanup from previous runs)
+                        thumb_prefix = f"{episode_stem}-thumb"
+                        for old_thumb in existing_thumbs.get((season_number, episode_number), []):
+                            if not old_thumb.name.startswith(thumb_prefix):
+                                continue
+                            try:
+                                os.remove(old_thumb.path)
+                                season_files.discard(old_thumb.name)
+                                if should_print_verbose:
+                                    print(f"      🗑️  删除旧thumb文件: {old_thumb.name}")
+                            except Exception as e:
+                                if should_print_verbose:
+                                    print(f"      ⚠️ 无法删除旧thumb文件 {old_thumb.path}: {e}")
+
+                        image_jobs.append({
+                            "season_number": season_number,
+                            "episode_number": episode_number,
+                            "thumb_filename": episode_thumb_filename,
+                            "thumb_path": os.path.join(season_dir, episode_thumb_filename),
+                            "fanart_path": os.path.join(season_dir, episode_fanart_filename),
+                            "images_data": season_stills[season_number].get(episode_number),
+                            "thumb_existed": episode_thumb_filename in season_files,
+                            "fanart_existed": episode_fanart_filename in season_files,
+                        })
 
                         files_created[f"season_{season_number}_episode_{episode_number}"] = episode_nfo_path
 
+                # Main artwork used as episode fallback; it does not change while episodes are processed
+                main_poster = os.path.join(media_dir, "poster.jpg")
+                main_fanart = os.path.join(media_dir, "fanart.jpg")
+                main_images = {
+                    "poster": main_poster if os.path.exists(main_poster) else None,
+                    "fanart": main_fanart if os.path.exists(main_fanart) else None,
+                }
+
+                # Download episode-specific images (thumb, fanart) concurrently, then
+                # report and fill in fallbacks in episode order
+                with ThreadPoolExecutor(max_workers=EPISODE_IMAGE_WORKERS) as executor:
+                    futures = [
+                        executor.submit(self._download_episode_still, tmdb_id, job["season_number"], job["episode_number"], job["thumb_path"], job["images_data"])
+                        for job in image_jobs
+                    ]
+
+                    for job, future in zip(image_jobs, futures):
+                        self._finish_episode_images(job, future.result(), main_images, input_data)
+
                 total_episodes = sum(len(episodes) for episodes in episodes_by_season.values() if episodes)
-                if self._should_print(input_data):
+                if should_print:
                     print(f"   处理完成: {len(episodes_by_season)} 季, {total_episodes} 集")
 
-        if self._should_print(input_data):
+        if should_print:
             print(f"   创建了 {len(files_created)} 个文件/目录")
 
         # Log output results
@@ -897,7 +857,118 @@ class MediaMetadataGraph:
 
         return {"output": output_data}
 
+    def _download_episode_still(self, tmdb_id: int, season_number: int, episode_number: int, thumb_path: str, episode_images_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Download the first episode still as the episode thumb, fetching stills from TMDB if not given."""
+        # The season details only carry each episode's primary still, so their count is not the real total
+        from_season = bool(episode_images_data and episode_images_data.get('stills'))
+        if not from_season:
+            try:
+                episode_images_data = self.tmdb.get_tv_episode_images(tmdb_id, season_number, episode_number)
+            except Exception:
+                episode_images_data = {}  # Fall back to the main artwork below
+        stills = episode_images_data.get('stills', [])
+
+        result = {"available_stills": len(stills), "from_season": from_season, "still_url": None, "thumb_downloaded": False}
+        if stills:
+            still = stills[0]  # Only download the first still
+            if still.get('file_path'):
+                result["still_url"] = self.artwork.get_image_url(still['file_path'])
+                try:
+                    result["thumb_downloaded"] = self.artwork.download_image(thumb_path, result["still_url"])
+                except OSError:
+                    pass  # Network errors are handled by download_image; this covers local write failures
+        return result
 
+    def _finish_episode_images(self, job: Dict[str, Any], result: Dict[str, Any], main_images: Dict[str, Optional[str]], input_data: Dict[str, Any]) -> None:
+        """Report a finished episode still download and fill in missing thumb/fanart from the main images."""
+        season_number = job["season_number"]
+        episode_number = job["episode_number"]
+        episode_thumb_path = job["thumb_path"]
+        episode_fanart_path = job["fanart_path"]
+        should_print = self._should_print(input_data)
+
+        if should_print:
+            print(f"      📸 处理剧集 S{season_number:02d}E{episode_number:02d} 图片...")
+            if result["from_season"]:
+                print("      📊 TMDB季数据提供剧集主截图")
+            else:
+                print(f"      📊 TMDB提供 {result['available_stills']} 张剧集截图")
+
+        # Emby standard: -thumb.jpg and -fanart.jpg
+        thumb_downloaded = False
+        fanart_downloaded = False
+        if result["available_stills"]:
+            if result["still_url"]:
+                if should_print:
+                    print(f"      ⬇️  下载剧集图片: {job['thumb_filename']}")
+                if result["thumb_downloaded"]:
+                    thumb_downloaded = True
+                    # Also copy as fanart
+                    try:
+                        FileSystemManager.link_or_copy(episode_thumb_path, episode_fanart_path)
+                        fanart_downloaded = True
+                    except OSError:
+                        pass
+                    if should_print:
+                        print("      ✓ thumb图片下载成功")
+                else:
+                    if should_print:
+                        print("      ✗ thumb图片下载失败")
+        else:
+            if should_print:
+                print("      ⚠️ 无可用剧集图片，将尝试复制其他图片")
+
+        # If thumb still missing, try to copy from main poster
+        if not thumb_downloaded:
+            main_poster = main_images["poster"]
+            if main_poster:
+                if should_print:
+                    print("      📋 thumb缺失，使用主poster...")
+                try:
+                    FileSystemManager.link_or_copy(main_poster, episode_thumb_path)
+                    thumb_downloaded = True
+                    if should_print:
+                        print("      ✓ episode thumb从主poster创建成功")
+                except OSError as e:
+                    if should_print:
+                        print(f"      ⚠️ 主poster复制失败: {e}")
+            else:
+                if should_print:
+                    print("      ⚠️ 主poster不存在")
+
+        # If fanart still missing, try to copy from main fanart
+        if not fanart_downloaded:
+            main_fanart = main_images["fanart"]
+            if main_fanart:
+                if should_print:
+                    print("      📋 fanart缺失，使用主fanart...")
+                try:
+                    FileSystemManager.link_or_copy(main_fanart, episode_fanart_path)
+                    fanart_downloaded = True
+                    if should_print:
+                        print("      ✓ episode fanart从主fanart创建成功")
+                except OSError as e:
+                    if should_print:
+                        print(f"      ⚠️ 主fanart复制失败: {e}")
+            else:
+                if should_print:
+                    print("      ⚠️ 主fanart不存在")
+
+        # Final status report (thumb and fanart), from what was written plus what the
+        # season directory scan found, rather than stat'ing both files again
+        if should_print:
+            thumb_exists = thumb_downloaded or job["thumb_existed"]
+            fanart_exists = fanart_downloaded or job["fanart_existed"]
+            status_parts = []
+            if thumb_exists:
+                status_parts.append("thumb✓")
+            else:
+                status_parts.append("thumb✗")
+            if fanart_exists:
+                status_parts.append("fanart✓")
+            else:
+                status_parts.append("fanart✗")
+            print(f"      📊 最终状态: {' | '.join(status_parts)}")
 
     def report_node(self, state: GraphState) -> Dict[str, Any]:
         """Generate final report."""
@@ -1,14 +1,15 @@
+from dataclasses import dataclass, field
 from typing import Dict, Any
-from pydantic import BaseModel
 
 
-class GraphState(BaseModel):
-    input: Dict[str, Any]
-    search: Dict[str, Any]
-    source_data: Dict[str, Any]
-    normalized: Dict[str, Any]
-    artwork: Dict[str, Any]
-    nfo: Dict[str, Any]
-    output: Dict[str, Any]
-    errors: Dict[str, Any]
+@dataclass(slots=True)
+class GraphState:
+    input: Dict[str, Any] = field(default_factory=dict)
+    search: Dict[str, Any] = field(default_factory=dict)
+    source_data: Dict[str, Any] = field(default_factory=dict)
+    normalized: Dict[str, Any] = field(default_factory=dict)
+    artwork: Dict[str, Any] = field(default_factory=dict)
+    nfo: Dict[str, Any] = field(default_factory=dict)
+    output: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Any] = field(default_factory=dict)
     inplace: bool = False  # In-place mode flag
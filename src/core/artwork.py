@@ -1,283 +1,282 @@
 import requests
 import os
+import shutil
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 from urllib.parse import urljoin
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+from .filesystem import FileSystemManager
+from .cache import CacheManager
+
+# Number of images downloaded in parallel
+DOWNLOAD_WORKERS = 16
+# Existing images at least this large are treated as complete and not fetched again
+MIN_EXISTING_IMAGE_SIZE = 1024
+
+
+class _KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections enable TCP keepalive on top of urllib3's TCP_NODELAY."""
+
+    socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(*args, **kwargs)
 
 
 class ArtworkDownloader:
-    def __init__(self, tmdb_api_key: str, proxy: Optional[Dict[str, str]] = None):
+    def __init__(self, tmdb_api_key: str, proxy: Optional[Dict[str, str]] = None, skip_existing: bool = False,
+                 cache: Optional[CacheManager] = None, cache_ttl_hours: int = 168):
         self.tmdb_api_key = tmdb_api_key
         self.proxy = proxy
-        self.session = requests.Session()
-        if proxy:
-            self.session.proxies.update(proxy)
+        # Optional cache for the TMDB image/credit/season listings; they rarely change between runs
+        self.cache = cache
+        self.cache_ttl_hours = cache_ttl_hours
+        self.skip_existing = skip_existing  # Opt-in: reuse images already downloaded by an earlier run
+        self.session = self._create_session(proxy)
+        # Fallback session for image hosts whose certificates fail verification
+        self.insecure_session = self._create_session(proxy)
+        self.insecure_session.verify = False
         self.base_image_url = "https://image.tmdb.org/t/p/original"
+        # Directories already created during this run; shared by download threads
+        self._ensured_dirs = set()
+        self._dirs_lock = threading.Lock()
+
+    @staticmethod
+    def _create_session(proxy: Optional[Dict[str, str]] = None) -> requests.Session:
+        """Create a session with a connection pool sized for parallel downloads and retries on transient errors."""
+        session = requests.Session()
+        # Exponential backoff with jitter so parallel workers don't retry in lockstep;
+        # Retry-After on 429/503 is honoured, and 4xx such as 404 fail immediately
+        retry = Retry(total=3, backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504], respect_retry_after_header=True)
+        adapter = _KeepAliveHTTPAdapter(pool_connections=DOWNLOAD_WORKERS * 2, pool_maxsize=DOWNLOAD_WORKERS * 2, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if proxy:
+            session.proxies.update(proxy)
+        return session
+
+    def get_image_url(self, file_path: str) -> str:
+        """Build the full-size image URL for a TMDB file path."""
+        if not file_path.startswith('/'):
+            file_path = '/' + file_path
+        return self.base_image_url + file_path
+
+    def _ensure_dir(self, directory: str) -> None:
+        """Create directory once; later calls for the same path skip the syscall."""
+        if directory in self._ensured_dirs:
+            return
+        with self._dirs_lock:
+            if directory not in self._ensured_dirs:
+                os.makedirs(directory, exist_ok=True)
+                self._ensured_dirs.add(directory)
+
+    def _write_response(self, response: requests.Response, image_path: str) -> None:
+        """Stream a response body to image_path."""
+        self._ensure_dir(os.path.dirname(image_path))
+        # Write to a temp file and swap it in, so files hardlinked to an
+        # earlier download of this path are replaced rather than overwritten
+        temp_path = image_path + ".part"
+        # copyfileobj loops in C with 1 MiB reads instead of iterating 8 KiB chunks
+        response.raw.decode_content = True
+        try:
+            with open(temp_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+            os.replace(temp_path, image_path)
+        except BaseException:
+            # Don't leave a partial download behind on reset, timeout or a full disk
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
 
-    def download_image(self, image_path: str, url: str, max_retries: int = 3) -> bool:
-        """Download a single image with retry logic."""
-        for attempt in range(max_retries):
+    def download_image(self, image_path: str, url: str) -> bool:
+        """Download a single image; transient failures are retried by the session adapter."""
+        try:
+            response = self.session.get(url, timeout=30, stream=True)
+            response.raise_for_status()
+            self._write_response(response, image_path)
+            return True
+        except requests.exceptions.SSLError:
+            # If SSL error occurs, try once with verify=False
             try:
-                response = self.session.get(url, timeout=30, stream=True)
+                response = self.insecure_session.get(url, timeout=30, stream=True)
                 response.raise_for_status()
-
-                os.makedirs(os.path.dirname(image_path), exist_ok=True)
-                with open(image_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                self._write_response(response, image_path)
                 return True
-            except requests.exceptions.SSLError as e:
-                # If SSL error occurs, try with verify=False
-                if attempt == 0:  # Only try once with verify=False
-                    try:
-                        response = self.session.get(url, timeout=30, stream=True, verify=False)
-                        response.raise_for_status()
-
-                        os.makedirs(os.path.dirname(image_path), exist_ok=True)
-                        with open(image_path, 'wb') as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                if chunk:
-                                    f.write(chunk)
-                        return True
-                    except requests.RequestException as e2:
-                        print(f"SSL error, retry with verify=False also failed for {url}: {e2}")
-                        continue
-                else:
-                    continue
-            except requests.RequestException as e:
-                if attempt == max_retries - 1:
-                    print(f"Failed to download {url}: {e}")
-                    return False
-                print(f"Retry {attempt + 1}/{max_retries} for {url}")
-                time.sleep(1)  # Wait before retry
-        return False
+            except (requests.RequestException, Urllib3HTTPError) as e2:
+                print(f"SSL error, retry with verify=False also failed for {url}: {e2}")
+                return False
+        except (requests.RequestException, Urllib3HTTPError) as e:
+            print(f"Failed to download {url}: {e}")
+            return False
+
+    def _get_json(self, url: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch a TMDB API endpoint and return the decoded JSON body, via the cache when given a key."""
+        use_cache = cache_key is not None and self.cache is not None
+        if use_cache:
+            data = self.cache.get(cache_key, ttl_hours=self.cache_ttl_hours)
+            if data is not None:
+                return data
+
+        response = self.session.get(url, params={"api_key": self.tmdb_api_key}, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        if use_cache:
+            self.cache.set(cache_key, data)
+        return data
 
     def download_all_images(self, media_type: str, tmdb_id: int, output_dir: str, verbose: bool = False, extra_images: bool = False) -> Dict[str, List[str]]:
         """Download all available images for a media item with robust error handling and Emby standard naming."""
-        # Get images from TMDB with retry logic
-        images_url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}/images"
-        params = {"api_key": self.tmdb_api_key}
+        # The images, credits and season stills endpoints are independent, so fetch them
+        # concurrently (each retried by the session adapter) and consume them below
+        api_url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}"
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            images_future = executor.submit(self._get_json, f"{api_url}/images", f"tmdb:{media_type}:{tmdb_id}:images")
+            credits_future = executor.submit(self._get_json, f"{api_url}/credits", f"tmdb:{media_type}:{tmdb_id}:credits")
+            season_future = None
+            if media_type == 'tv' and extra_images:
+                season_future = executor.submit(self._get_json, f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/1",
+                                                f"tmdb:tv:{tmdb_id}:season:1")
 
-        images_data = None
-        for attempt in range(3):
-            try:
-                response = self.session.get(images_url, params=params, timeout=30)
-                response.raise_for_status()
-                images_data = response.json()
-                # Only show total images count if extra_images is enabled, since we only use extra images in that case
-                if verbose and extra_images:
-                    total_images = len(images_data.get('posters', [])) + len(images_data.get('backdrops', [])) + len(images_data.get('logos', []))
-                    print(f"   获取到图片数据: 共{total_images}张图片")
-                break
-            except requests.RequestException as e:
-                if attempt == 2:
-                    if verbose:
-                        print(f"Failed to get images for {media_type} {tmdb_id}: {e}")
-                    return {}
-                if verbose:
-                    print(f"Retry {attempt + 1}/3 for images API")
-                time.sleep(1)
+        try:
+            images_data = images_future.result()
+            # Only show total images count if extra_images is enabled, since we only use extra images in that case
+        except requests.RequestException as e:
+            if verbose:
+                print(f"Failed to get images for {media_type} {tmdb_id}: {e}")
+            return {}
+
+        # Look up each image list once; None means TMDB returned no such list
+        posters = images_data.get('posters') if images_data else None
+        backdrops = images_data.get('backdrops') if images_data else None
+        logos = images_data.get('logos') if images_data else None
+        if verbose and extra_images:
+            total_images = len(posters or []) + len(backdrops or []) + len(logos or [])
+            print(f"   获取到图片数据: 共{total_images}张图片")
 
         downloaded_images = {}
 
+        # Download jobs: (category, filename, filepath, url, copies); copies are
+        # (copy_path, category, filename) made from the file once it is downloaded
+        jobs = []
+
+        # Create every directory this run writes into once, up front
+        extra_dir = os.path.join(output_dir, "Extra")
+        stills_dir = os.path.join(extra_dir, "stills")
+        self._ensure_dir(output_dir)
+        if extra_images:
+            self._ensure_dir(extra_dir)
+            if media_type == 'tv':
+                self._ensure_dir(stills_dir)
+
         # Download required images (poster, fanart, logo) - always download these
         # Copy first poster to parent directory as main poster (Emby standard)
-        if images_data and 'posters' in images_data and images_data['posters']:
-            poster = images_data['posters'][0]  # First poster
+        if posters:
+            downloaded_images['poster'] = []
+            poster = posters[0]  # First poster
             if poster.get('file_path'):
-                file_path = poster['file_path']
-                if not file_path.startswith('/'):
-                    file_path = '/' + file_path
-                url = self.base_image_url + file_path
+                url = self.get_image_url(poster['file_path'])
                 main_poster_path = os.path.join(output_dir, "poster.jpg")
-                if self.download_image(main_poster_path, url):
-                    downloaded_images['poster'] = ["poster.jpg"]
-                    if verbose:
-                        print(f"   ✓ 设置主海报 (poster.jpg)")
-                else:
-                    downloaded_images['poster'] = []
-            else:
-                downloaded_images['poster'] = []
+                jobs.append(('poster', "poster.jpg", main_poster_path, url, []))
 
         # Copy first fanart/backdrop to parent directory as main fanart (Emby standard)
-        if images_data and 'backdrops' in images_data and images_data['backdrops']:
-            backdrop = images_data['backdrops'][0]  # First backdrop
+        if backdrops:
+            downloaded_images['fanart'] = []
+            backdrop = backdrops[0]  # First backdrop
             if backdrop.get('file_path'):
-                file_path = backdrop['file_path']
-                if not file_path.startswith('/'):
-                    file_path = '/' + file_path
-                url = self.base_image_url + file_path
+                url = self.get_image_url(backdrop['file_path'])
                 main_fanart_path = os.path.join(output_dir, "fanart.jpg")
-                banner_path = os.path.join(output_dir, "banner.jpg") if media_type == "tv" else None
-                if self.download_image(main_fanart_path, url):
-                    downloaded_images['fanart'] = ["fanart.jpg"]
-                    # Also create banner.jpg for TV shows (use same image)
-                    if banner_path and media_type == "tv":
-                        try:
-                            import shutil
-                            shutil.copy2(main_fanart_path, banner_path)
-                        except:
-                            pass
-                    if verbose:
-                        if media_type == "tv":
-                            print(f"   ✓ 设置主背景图 (fanart.jpg + banner.jpg)")
-                        else:
-                            print(f"   ✓ 设置主背景图 (fanart.jpg)")
-                else:
-                    downloaded_images['fanart'] = []
-            else:
-                downloaded_images['fanart'] = []
+                copies = []
+                # Also create banner.jpg for TV shows (use same image)
+                if media_type == "tv":
+                    copies.append((os.path.join(output_dir, "banner.jpg"), None, None))
+                jobs.append(('fanart', "fanart.jpg", main_fanart_path, url, copies))
 
         # Copy first logo to parent directory (Emby standard naming)
-        if images_data and 'logos' in images_data and images_data['logos']:
-            logo = images_data['logos'][0]  # First logo
+        if logos:
+            downloaded_images['logo'] = []
+            logo = logos[0]  # First logo
             if logo.get('file_path'):
-                file_path = logo['file_path']
-                if not file_path.startswith('/'):
-                    file_path = '/' + file_path
-                url = self.base_image_url + file_path
+                url = self.get_image_url(logo['file_path'])
                 clearlogo_path = os.path.join(output_dir, "clearlogo.png")
                 clearart_path = os.path.join(output_dir, "clearart.png")
-                if self.download_image(clearlogo_path, url):
-                    downloaded_images['logo'] = ["clearlogo.png"]
-                    try:
-                        import shutil
-                        shutil.copy2(clearlogo_path, clearart_path)
-                    except:
-                        pass
-                    if verbose:
-                        print(f"   ✓ 设置主标志 (clearlogo.png + clearart.png)")
-                else:
-                    downloaded_images['logo'] = []
-            else:
-                downloaded_images['logo'] = []
+                jobs.append(('logo', "clearlogo.png", clearlogo_path, url, [(clearart_path, None, None)]))
 
         # Download additional images only if extra_images is True
         if extra_images:
-            images_dir = os.path.join(output_dir, "Extra")
-            os.makedirs(images_dir, exist_ok=True)
-
             # Download all posters to Extra folder
-            if images_data and 'posters' in images_data:
+            if posters is not None:
                 downloaded_images['poster_extra'] = []
-                posters = images_data['posters']
                 if verbose and len(posters) > 1:
                     print(f"   下载额外 {len(posters)-1} 张海报")
 
-                for i, poster in enumerate(posters):
-                    if i == 0:  # Skip first poster (already downloaded)
-                        continue
+                for poster in posters[1:]:  # Skip first poster (already downloaded)
                     if poster.get('file_path'):
-                        file_path = poster['file_path']
-                        if not file_path.startswith('/'):
-                            file_path = '/' + file_path
-                        url = self.base_image_url + file_path
+                        url = self.get_image_url(poster['file_path'])
                         filename = f"poster.jpg"
-                        filepath = os.path.join(images_dir, filename)
-                        try:
-                            if self.download_image(filepath, url):
-                                downloaded_images['poster_extra'].append(filename)
-                        except Exception as e:
-                            if verbose:
-                                print(f"     ✗ 额外海报 {i+1} 下载失败: {e}")
-                            continue
+                        filepath = os.path.join(extra_dir, filename)
+                        jobs.append(('poster_extra', filename, filepath, url, []))
 
             # Download all backdrops/fanart to Extra folder
-            if images_data and 'backdrops' in images_data:
+            if backdrops is not None:
                 downloaded_images['fanart_extra'] = []
                 downloaded_images['backdrop_extra'] = []
-                backdrops = images_data['backdrops']
                 if verbose and len(backdrops) > 1:
                     print(f"   下载额外 {len(backdrops)-1} 张背景图")
 
-                for i, backdrop in enumerate(backdrops):
-                    if i == 0:  # Skip first backdrop (already downloaded)
-                        continue
+                for backdrop in backdrops[1:]:  # Skip first backdrop (already downloaded)
                     if backdrop.get('file_path'):
-                        file_path = backdrop['file_path']
-                        if not file_path.startswith('/'):
-                            file_path = '/' + file_path
-                        url = self.base_image_url + file_path
+                        url = self.get_image_url(backdrop['file_path'])
 
                         backdrop_filename = f"backdrop.jpg"
                         fanart_filename = f"fanart.jpg"
 
-                        backdrop_filepath = os.path.join(images_dir, backdrop_filename)
-                        fanart_filepath = os.path.join(images_dir, fanart_filename)
-
-                        try:
-                            if self.download_image(backdrop_filepath, url):
-                                downloaded_images['backdrop_extra'].append(backdrop_filename)
-                                # Copy the same file for fanart
-                                import shutil
-                                shutil.copy2(backdrop_filepath, fanart_filepath)
-                                downloaded_images['fanart_extra'].append(fanart_filename)
-                        except Exception as e:
-                            if verbose:
-                                print(f"     ✗ 额外背景图 {i+1} 下载失败: {e}")
-                            continue
+                        backdrop_filepath = os.path.join(extra_dir, backdrop_filename)
+                        fanart_filepath = os.path.join(extra_dir, fanart_filename)
+
+                        # Copy the same file for fanart
+                        jobs.append(('backdrop_extra', backdrop_filename, backdrop_filepath, url,
+                                     [(fanart_filepath, 'fanart_extra', fanart_filename)]))
 
             # Download all logos to Extra folder
-            if images_data and 'logos' in images_data:
+            if logos is not None:
                 downloaded_images['logo_extra'] = []
-                logos = images_data['logos']
                 if verbose and len(logos) > 1:
                     print(f"   下载额外 {len(logos)-1} 张标志")
 
-                for i, logo in enumerate(logos):
-                    if i == 0:  # Skip first logo (already downloaded)
-                        continue
+                for logo in logos[1:]:  # Skip first logo (already downloaded)
                     if logo.get('file_path'):
-                        file_path = logo['file_path']
-                        if not file_path.startswith('/'):
-                            file_path = '/' + file_path
-                        url = self.base_image_url + file_path
+                        url = self.get_image_url(logo['file_path'])
                         filename = f"logo.png"
-                        filepath = os.path.join(images_dir, filename)
-                        try:
-                            if self.download_image(filepath, url):
-                                downloaded_images['logo_extra'].append(filename)
-                        except Exception as e:
-                            if verbose:
-                                print(f"     ✗ 额外标志 {i+1} 下载失败: {e}")
-                            continue
-
-        # Create stills subdirectory for TV shows (only if extra_images is True)
+                        filepath = os.path.join(extra_dir, filename)
+                        jobs.append(('logo_extra', filename, filepath, url, []))
+
+        # Episode stills for TV shows (only if extra_images is True)
         if media_type == 'tv' and extra_images:
             downloaded_images['stills'] = []
-            extra_dir = os.path.join(output_dir, "Extra")
-            os.makedirs(extra_dir, exist_ok=True)
-            stills_dir = os.path.join(extra_dir, "stills")
-            os.makedirs(stills_dir, exist_ok=True)
 
             # Get episode stills for the first season
             try:
-                episodes_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/season/1"
-                response = self.session.get(episodes_url, params={"api_key": self.tmdb_api_key}, timeout=30)
-                response.raise_for_status()
-                season_data = response.json()
+                season_data = season_future.result()
 
-                episode_stills = []
                 for episode in season_data.get('episodes', [])[:5]:  # Limit to first 5 episodes
                     if episode.get('still_path'):
-                        still_path = episode['still_path']
-                        if not still_path.startswith('/'):
-                            still_path = '/' + still_path
-                        url = self.base_image_url + still_path
+                        url = self.get_image_url(episode['still_path'])
                         filename = f"S01E{episode['episode_number']:02d}.jpg"
                         filepath = os.path.join(stills_dir, filename)
-                        try:
-                            if self.download_image(filepath, url):
-                                episode_stills.append(f"Extra/stills/{filename}")
-                        except Exception as e:
-                            if verbose:
-                                print(f"     ✗ 剧集截图 {filename} 下载失败: {e}")
-                            continue
-
-                downloaded_images['stills'] = episode_stills
-                if verbose and episode_stills:
-                    print(f"   ✓ 下载了 {len(episode_stills)} 张剧集截图")
+                        jobs.append(('stills', f"Extra/stills/{filename}", filepath, url, []))
 
             except requests.RequestException as e:
                 if verbose:
@@ -288,44 +287,103 @@ class ArtworkDownloader:
 
         # Get credits data to find actor profile paths
         try:
-            credits_url = f"https://api.themoviedb.org/3/{media_type}/{tmdb_id}/credits"
-            response = self.session.get(credits_url, params={"api_key": self.tmdb_api_key}, timeout=30)
-            response.raise_for_status()
-            credits_data = response.json()
+            credits_data = credits_future.result()
 
-            actor_images = []
             for actor in credits_data.get('cast', [])[:10]:  # Limit to first 10 actors
                 if actor.get('profile_path'):
-                    profile_path = actor['profile_path']
-                    if not profile_path.startswith('/'):
-                        profile_path = '/' + profile_path
-
-                    url = self.base_image_url + profile_path
+                    url = self.get_image_url(actor['profile_path'])
                     # Use clean actor names directly in root directory
                     actor_name = actor.get('name', 'unknown')
-                    actor_name_clean = "".join(c for c in actor_name if c.isalnum() or c in ' _-').strip()
-                    actor_name_clean = actor_name_clean.replace(' ', '_')
+                    actor_name_clean = FileSystemManager.clean_actor_name(actor_name)
                     filename = f"{actor_name_clean}.jpg"
                     filepath = os.path.join(output_dir, filename)
-
-                    try:
-                        if self.download_image(filepath, url):
-                            actor_images.append(filename)
-                    except Exception as e:
-                        if verbose:
-                            print(f"     ✗ 演员头像 {filename} 下载失败: {e}")
-                        continue
-
-            downloaded_images['actors'] = actor_images
-            if verbose and actor_images:
-                print(f"   ✓ 下载了{len(actor_images)}张演员头像到根目录")
+                    jobs.append(('actors', filename, filepath, url, []))
 
         except requests.RequestException as e:
             if verbose:
                 print(f"   ✗ 获取演员头像失败: {e}")
 
+        # Fetch everything concurrently, then record results in job order
+        results = self._download_jobs(jobs, verbose)
+        for (category, filename, filepath, url, copies), downloaded in zip(jobs, results):
+            if not downloaded:
+                continue
+            downloaded_images[category].append(filename)
+            for copy_path, copy_category, copy_filename in copies:
+                try:
+                    FileSystemManager.link_or_copy(filepath, copy_path)
+                    if copy_category:
+                        downloaded_images[copy_category].append(copy_filename)
+                except:
+                    pass
+
+        if verbose:
+            if downloaded_images.get('poster'):
+                print(f"   ✓ 设置主海报 (poster.jpg)")
+            if downloaded_images.get('fanart'):
+                if media_type == "tv":
+                    print(f"   ✓ 设置主背景图 (fanart.jpg + banner.jpg)")
+                else:
+                    print(f"   ✓ 设置主背景图 (fanart.jpg)")
+            if downloaded_images.get('logo'):
+                print(f"   ✓ 设置主标志 (clearlogo.png + clearart.png)")
+            if downloaded_images.get('stills'):
+                print(f"   ✓ 下载了 {len(downloaded_images['stills'])} 张剧集截图")
+            if downloaded_images['actors']:
+                print(f"   ✓ 下载了{len(downloaded_images['actors'])}张演员头像到根目录")
+
         if verbose:
             total_downloaded = sum(len(images) for images in downloaded_images.values() if isinstance(images, list))
             print(f"   图片下载完成: 共{total_downloaded}张")
 
         return downloaded_images
+
+    @staticmethod
+    def _is_downloaded(image_path: str) -> bool:
+        """Check whether a complete image from an earlier run is already on disk."""
+        try:
+            return os.path.getsize(image_path) >= MIN_EXISTING_IMAGE_SIZE
+        except OSError:
+            return False
+
+    def _download_jobs(self, jobs: List[tuple], verbose: bool = False) -> List[bool]:
+        """Download (category, filename, filepath, url, copies) jobs concurrently, returning success flags in job order."""
+        # Several jobs may target the same file; only the last one is fetched so
+        # two threads never write the same path
+        last_job = {job[2]: i for i, job in enumerate(jobs)}
+        results = [False] * len(jobs)
+
+        # The same URL wanted at several paths is fetched once and linked to the others
+        to_fetch = []
+        first_by_url = {}
+        duplicates = []
+        for i, job in enumerate(jobs):
+            if last_job[job[2]] != i:
+                continue
+            if self.skip_existing and self._is_downloaded(job[2]):
+                results[i] = True
+            elif job[3] in first_by_url:
+                duplicates.append((i, first_by_url[job[3]]))
+            else:
+                first_by_url[job[3]] = i
+                to_fetch.append(i)
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {executor.submit(self.download_image, jobs[i][2], jobs[i][3]): i for i in to_fetch}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    if verbose:
+                        print(f"     ✗ {jobs[i][1]} 下载失败: {e}")
+
+        for i, source in duplicates:
+            if results[source]:
+                try:
+                    FileSystemManager.link_or_copy(jobs[source][2], jobs[i][2])
+                    results[i] = True
+                except OSError:
+                    pass
+
+        return results
@@ -1,23 +1,36 @@
 import os
 import json
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+from . import jsonutil
 
 
 class CacheManager:
-    def __init__(self, cache_dir: str = ".cache"):
+    def __init__(self, cache_dir: str = ".cache", memory_size: int = 256):
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        # In-process LRU of recently used entries: cache path -> (stored_at, serialized JSON).
+        # Entries are kept serialized so callers always get a fresh copy, as from disk.
+        self._memory = OrderedDict()
+        self._memory_size = memory_size
+        self._memory_lock = threading.Lock()
 
     def _get_cache_key(self, key: str) -> str:
         """Generate cache key from string."""
-        return hashlib.md5(key.encode()).hexdigest()
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
 
     def _get_cache_path(self, key: str) -> str:
         """Get full path for cache file."""
         return os.path.join(self.cache_dir, f"{self._get_cache_key(key)}.json")
 
+    def _get_legacy_cache_path(self, key: str) -> str:
+        """Get path of a cache file written under the old MD5 naming."""
+        return os.path.join(self.cache_dir, f"{hashlib.md5(key.encode()).hexdigest()}.json")
+
     def _is_expired(self, cache_path: str, ttl_hours: int = 24) -> bool:
         """Check if cache file is expired."""
         if not os.path.exists(cache_path):
@@ -26,16 +39,41 @@ class CacheManager:
         file_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
         return datetime.now() - file_time > timedelta(hours=ttl_hours)
 
+    def _remember(self, cache_path: str, stored_at: float, content: bytes) -> None:
+        """Add an entry to the in-memory LRU, evicting the least recently used."""
+        with self._memory_lock:
+            self._memory[cache_path] = (stored_at, content)
+            self._memory.move_to_end(cache_path)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+
     def get(self, key: str, ttl_hours: int = 24) -> Optional[Dict[str, Any]]:
         """Get cached data if not expired."""
         cache_path = self._get_cache_path(key)
 
+        with self._memory_lock:
+            entry = self._memory.get(cache_path)
+            if entry is not None:
+                self._memory.move_to_end(cache_path)
+        if entry is not None and time.time() - entry[0] <= ttl_hours * 3600:
+            return jsonutil.loads(entry[1])
+
+        if not os.path.exists(cache_path):
+            # Adopt an entry cached before the switch from MD5 file names
+            try:
+                os.replace(self._get_legacy_cache_path(key), cache_path)
+            except OSError:
+                return None
+
         if self._is_expired(cache_path, ttl_hours):
             return None
 
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(cache_path, 'rb') as f:
+                content = f.read()
+            data = jsonutil.loads(content)
+            self._remember(cache_path, os.path.getmtime(cache_path), content)
+            return data
         except (json.JSONDecodeError, FileNotFoundError):
             return None
 
@@ -44,21 +82,26 @@ class CacheManager:
         cache_path = self._get_cache_path(key)
 
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            content = jsonutil.dumps(data)
+            with open(cache_path, 'wb') as f:
+                f.write(content)
+            self._remember(cache_path, time.time(), content)
         except Exception as e:
             print(f"Failed to cache data: {e}")
 
     def clear_expired(self, ttl_hours: int = 24) -> int:
         """Clear expired cache files."""
         cleared = 0
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.cache_dir, filename)
-                if self._is_expired(filepath, ttl_hours):
-                    try:
-                        os.remove(filepath)
+        cutoff = time.time() - ttl_hours * 3600
+        # scandir entries carry their stat results, so there is no per-file exists/getmtime
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
                         cleared += 1
-                    except OSError:
-                        pass
+                except OSError:
+                    pass
         return cleared
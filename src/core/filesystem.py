@@ -1,6 +1,15 @@
+import errno
 import os
+import re
 import shutil
-from typing import Optional
+from typing import Optional, Union
+
+# Characters that are illegal in file and directory names: \ / : * ? " < > |
+_ILLEGAL_FILENAME_CHARS = re.compile(r'[\\/:"*?<>|]')
+# Anything other than letters, digits, spaces, underscores and hyphens in actor names
+_ACTOR_NAME_UNSAFE_CHARS = re.compile(r'[^\w \-]')
+# Characters stripped from episode titles used in filenames ('/' is handled separately)
+_UNSAFE_EPISODE_TITLE_CHARS = str.maketrans('', '', '\\:*?"<>|')
 
 
 class FileSystemManager:
@@ -8,9 +17,7 @@ class FileSystemManager:
     def create_media_directory(base_dir: str, title: str, year: int, media_type: str, inplace: bool = False) -> str:
         """Create directory structure for media item."""
         # Sanitize title for directory name - only remove filesystem-illegal characters
-        import re
-        # Remove only characters that are illegal in filesystem: \ / : * ? " < > |
-        safe_title = re.sub(r'[\\/:"*?<>|]', '', title).strip()
+        safe_title = _ILLEGAL_FILENAME_CHARS.sub('', title).strip()
         dir_name = f"{safe_title} ({year})"
 
         if inplace:
@@ -31,11 +38,10 @@ class FileSystemManager:
         return season_dir
 
     @staticmethod
-    def write_nfo_file(directory: str, filename: str, content: str) -> str:
+    def write_nfo_file(directory: str, filename: str, content: Union[str, bytes]) -> str:
         """Write NFO file to directory."""
         nfo_path = os.path.join(directory, filename)
-        with open(nfo_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        FileSystemManager._write_bytes(nfo_path, content.encode('utf-8') if isinstance(content, str) else content)
         return nfo_path
 
     @staticmethod
@@ -48,6 +54,62 @@ class FileSystemManager:
         shutil.copy2(source, dest_path)
         return dest_path
 
+    @staticmethod
+    def link_or_copy(source: str, destination: str) -> str:
+        """Hardlink source to destination, falling back to a copy."""
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            return destination
+
+        try:
+            if os.path.lexists(destination):
+                os.remove(destination)
+            os.link(source, destination)
+            return destination
+        except OSError:
+            pass  # e.g. filesystems without hardlink support; copy instead
+
+        FileSystemManager.fast_copy(source, destination)
+        return destination
+
+    @staticmethod
+    def fast_copy(source: str, destination: str) -> str:
+        """Copy a file in-kernel with os.copy_file_range where supported, then copy metadata."""
+        # Opening an existing hardlink of the source for writing would truncate the source itself
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            return destination
+
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is None:
+            shutil.copy2(source, destination)
+            return destination
+
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+            shutil.copyfile(source, destination)
+        shutil.copystat(source, destination)
+        return destination
+
+    @staticmethod
+    def safe_episode_title(episode_title: str) -> str:
+        """Clean episode title for filenames: take the part before '/', otherwise remove invalid chars."""
+        if '/' in episode_title:
+            return episode_title.split('/')[0].strip()
+        return episode_title.translate(_UNSAFE_EPISODE_TITLE_CHARS).strip()
+
+    @staticmethod
+    def clean_actor_name(actor_name: str) -> str:
+        """Clean actor name for image filenames: keep letters, digits, '_' and '-', spaces become '_'."""
+        return _ACTOR_NAME_UNSAFE_CHARS.sub('', actor_name).strip().replace(' ', '_')
+
     @staticmethod
     def create_images_directory(media_dir: str) -> str:
         """Create images subdirectory."""
@@ -64,33 +126,35 @@ class FileSystemManager:
         return season_dir, season_dir
 
     @staticmethod
-    def write_episode_nfo(season_dir: str, title: str, season: int, episode: int, episode_title: str, content: str) -> str:
+    def write_episode_nfo(season_dir: str, title: str, season: int, episode: int, episode_title: str, content: Union[str, bytes]) -> str:
         """Write episode NFO file."""
-        # Clean episode title: if contains '/', take part before '/', otherwise remove other invalid chars
-        if '/' in episode_title:
-            safe_episode_title = episode_title.split('/')[0].strip()
-        else:
-            safe_episode_title = "".join(c for c in episode_title if c not in '\\:*?"<>|').strip()
+        safe_episode_title = FileSystemManager.safe_episode_title(episode_title)
         nfo_filename = f"{title} - S{season:02d}E{episode:02d} - {safe_episode_title}.nfo"
         nfo_path = os.path.join(season_dir, nfo_filename)
 
-        with open(nfo_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        FileSystemManager._write_bytes(nfo_path, content.encode('utf-8') if isinstance(content, str) else content)
         return nfo_path
 
+    @staticmethod
+    def _write_bytes(path: str, data: bytes) -> None:
+        """Write a small file with one unbuffered os.write instead of a buffered text file."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
     @staticmethod
     def write_episode_poster(episode_dir: str, title: str, season: int, episode: int, episode_title: str, poster_path: str) -> Optional[str]:
         """Copy poster to episode directory as thumb."""
         if not os.path.exists(poster_path):
             return None
 
-        # Clean episode title: if contains '/', take part before '/', otherwise remove other invalid chars
-        if '/' in episode_title:
-            safe_episode_title = episode_title.split('/')[0].strip()
-        else:
-            safe_episode_title = "".join(c for c in episode_title if c not in '\\:*?"<>|').strip()
+        safe_episode_title = FileSystemManager.safe_episode_title(episode_title)
         poster_filename = f"{title} - S{season:02d}E{episode:02d} - {safe_episode_title}-thumb.jpg"
         dest_path = os.path.join(episode_dir, poster_filename)
 
-        shutil.copy2(poster_path, dest_path)
+        FileSystemManager.fast_copy(poster_path, dest_path)
         return dest_path
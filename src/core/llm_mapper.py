@@ -1,5 +1,14 @@
+from itertools import islice
 from typing import Dict, Any, List
 from .schema_nfo import MovieNfo, TvShowNfo, EpisodeNfo
+from .filesystem import FileSystemManager
+
+_WRITER_JOBS = frozenset({"Writer", "Screenplay", "Story"})
+
+# Shared read-only defaults; the NFO models copy list fields on validation
+_NO_ITEMS = ()
+_POSTER_FILENAME = "poster.jpg"
+_FANART_FILENAME = "fanart.jpg"
 
 
 class DirectMapper:
@@ -9,115 +18,121 @@ class DirectMapper:
     def map_to_movie_nfo(internal_data: Dict[str, Any]) -> MovieNfo:
         """Direct mapping from internal schema to MovieNfo."""
         return MovieNfo(
-            title=internal_data.get('title_zh') or internal_data.get('title', ''),
-            originaltitle=internal_data.get('original_title', ''),
-            year=internal_data.get('year', 0),
-            premiered=internal_data.get('release_date', ''),
-            plot=internal_data.get('plot_zh') or internal_data.get('plot', ''),
-            tagline=internal_data.get('tagline_zh') or internal_data.get('tagline', ''),
-            runtime=internal_data.get('runtime', 0),
-            rating=internal_data.get('rating', 0.0),
-            votes=internal_data.get('rating_count', 0),
-            genre=internal_data.get('genres_zh', internal_data.get('genres', [])),
-            country=internal_data.get('countries', []),
-            studio=internal_data.get('studios', []),
-            credits=internal_data.get('writers', []),
-            director=internal_data.get('directors', []),
-            actor=DirectMapper._format_cast(internal_data.get('cast', [])),
-            thumb="poster.jpg",
-            fanart="fanart.jpg",
-            tags=internal_data.get('keywords_zh', internal_data.get('keywords', [])),
+            **DirectMapper._common_fields(internal_data),
             tmdb_id=internal_data.get('tmdb_id', None)
         )
 
     @staticmethod
     def map_to_tvshow_nfo(internal_data: Dict[str, Any]) -> TvShowNfo:
         """Direct mapping from internal schema to TvShowNfo."""
+        get = internal_data.get
         return TvShowNfo(
-            title=internal_data.get('title_zh') or internal_data.get('title', ''),
-            originaltitle=internal_data.get('original_title', ''),
-            year=internal_data.get('year', 0),
-            premiered=internal_data.get('release_date', ''),
-            plot=internal_data.get('plot_zh') or internal_data.get('plot', ''),
-            tagline=internal_data.get('tagline_zh') or internal_data.get('tagline', ''),
-            runtime=internal_data.get('runtime', 0),
-            rating=internal_data.get('rating', 0.0),
-            votes=internal_data.get('rating_count', 0),
-            genre=internal_data.get('genres_zh', internal_data.get('genres', [])),
-            country=internal_data.get('countries', []),
-            studio=internal_data.get('studios', []),
-            credits=internal_data.get('writers', []),
-            director=internal_data.get('directors', []),
-            actor=DirectMapper._format_cast(internal_data.get('cast', [])),
-            thumb="poster.jpg",
-            fanart="fanart.jpg",
-            tags=internal_data.get('keywords_zh', internal_data.get('keywords', [])),
-            network=internal_data.get('network', ''),
-            networks=internal_data.get('networks', []),
-            status=internal_data.get('status', ''),
-            homepage=internal_data.get('homepage', ''),
-            tmdb_id=internal_data.get('tmdb_id', None)
+            **DirectMapper._common_fields(internal_data),
+            network=get('network', ''),
+            networks=get('networks', _NO_ITEMS),
+            status=get('status', ''),
+            homepage=get('homepage', ''),
+            tmdb_id=get('tmdb_id', None)
         )
 
+    @staticmethod
+    def _common_fields(internal_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields shared by MovieNfo and TvShowNfo."""
+        get = internal_data.get
+        return {
+            "title": get('title_zh') or get('title', ''),
+            "originaltitle": get('original_title', ''),
+            "year": get('year', 0),
+            "premiered": get('release_date', ''),
+            "plot": get('plot_zh') or get('plot', ''),
+            "tagline": get('tagline_zh') or get('tagline', ''),
+            "runtime": get('runtime', 0),
+            "rating": get('rating', 0.0),
+            "votes": get('rating_count', 0),
+            "genre": get('genres_zh', get('genres', _NO_ITEMS)),
+            "country": get('countries', _NO_ITEMS),
+            "studio": get('studios', _NO_ITEMS),
+            "credits": get('writers', _NO_ITEMS),
+            "director": get('directors', _NO_ITEMS),
+            "actor": DirectMapper._format_cast(get('cast', _NO_ITEMS)),
+            "thumb": _POSTER_FILENAME,
+            "fanart": _FANART_FILENAME,
+            "tags": get('keywords_zh', get('keywords', _NO_ITEMS)),
+        }
+
     @staticmethod
     def map_to_episode_nfo(internal_data: Dict[str, Any], episode_data: Dict[str, Any], show_data: Dict[str, Any]) -> EpisodeNfo:
         """Direct mapping from internal schema to EpisodeNfo."""
-        season_number = episode_data.get("season_number", 0)
-        episode_number = episode_data.get("episode_number", 0)
-        show_title = show_data.get("title_zh") or show_data.get("title", "Unknown Show")
+        episode_get = episode_data.get
+        show_get = show_data.get
+        season_number = episode_get("season_number", 0)
+        episode_number = episode_get("episode_number", 0)
+        show_title = show_get("title_zh") or show_get("title", "Unknown Show")
 
         # Use the episode name from TMDB, prefer translated Chinese version
-        episode_name = episode_data.get("name_zh", episode_data.get("name", f"Episode {episode_number}"))
+        episode_name = episode_get("name_zh", episode_get("name", f"Episode {episode_number}"))
 
         # Get basic episode info
-        year = episode_data.get("air_date", "")[:4] if episode_data.get("air_date") else show_data.get("year", 2024)
-        premiered = episode_data.get("air_date", "")
-        runtime = episode_data.get("runtime", show_data.get("episode_runtime", [25])[0] if show_data.get("episode_runtime") else 25)
+        year = episode_get("air_date", "")[:4] if episode_get("air_date") else show_get("year", 2024)
+        premiered = episode_get("air_date", "")
+        runtime = episode_get("runtime", show_get("episode_runtime", [25])[0] if show_get("episode_runtime") else 25)
         # Use translated plot if available
-        plot = episode_data.get("overview_zh", episode_data.get("overview", ""))
-        rating = episode_data.get("vote_average", 0.0)
-        votes = episode_data.get("vote_count", 0)
+        plot = episode_get("overview_zh", episode_get("overview", ""))
+        rating = episode_get("vote_average", 0.0)
+        votes = episode_get("vote_count", 0)
 
         # Get show-level information
-        genres = show_data.get('genres_zh', show_data.get('genres', []))
-        countries = show_data.get('countries', [])
-        studios = show_data.get('studios', [])
+        genres = show_get('genres_zh', show_get('genres', _NO_ITEMS))
+        countries = show_get('countries', _NO_ITEMS)
+        studios = show_get('studios', _NO_ITEMS)
 
         # Extract episode-level crew information
         episode_directors = []
         episode_writers = []
 
         # Check episode-level crew first
-        if episode_data.get("crew"):
+        if episode_get("crew"):
+            add_director = episode_directors.append
+            add_writer = episode_writers.append
             for crew_member in episode_data["crew"]:
-                job = crew_member.get("job", "")
-                department = crew_member.get("department", "")
-                name = crew_member.get("name", "")
+                member_get = crew_member.get
+                job = member_get("job", "")
+                department = member_get("department", "")
 
                 if job == "Director" or department == "Directing":
-                    episode_directors.append(name)
-                elif job in ["Writer", "Screenplay", "Story"] or department == "Writing":
-                    episode_writers.append(name)
+                    add_director(member_get("name", ""))
+                elif job in _WRITER_JOBS or department == "Writing":
+                    add_writer(member_get("name", ""))
 
         # Fall back to show-level crew if episode doesn't have specific crew
         if not episode_directors:
-            episode_directors = show_data.get('directors', [])
+            episode_directors = show_get('directors', _NO_ITEMS)
         if not episode_writers:
-            episode_writers = show_data.get('writers', [])
+            episode_writers = show_get('writers', _NO_ITEMS)
 
-        cast = DirectMapper._format_cast(show_data.get('cast', []))
+        cast = DirectMapper._format_cast(show_get('cast', _NO_ITEMS))
 
         # Generate correct episode image filenames (Emby standard)
-        show_title_for_filename = show_data.get("title_zh") or show_data.get("title", "Unknown Show")
+        episode_prefix = f"{show_title} - S{season_number:02d}E{episode_number:02d} - {episode_name}"
         # Use -thumb.jpg for episode thumbs (Emby standard)
-        episode_thumb_filename = f"{show_title_for_filename} - S{season_number:02d}E{episode_number:02d} - {episode_name}-thumb.jpg"
+        episode_thumb_filename = episode_prefix + "-thumb.jpg"
         # Use episode-specific fanart with fallback to main fanart
-        episode_fanart_filename = f"{show_title_for_filename} - S{season_number:02d}E{episode_number:02d} - {episode_name}-fanart.jpg"
+        episode_fanart_filename = episode_prefix + "-fanart.jpg"
+
+        # Only add set information for TV shows with multiple episodes/seasons
+        if show_get("number_of_seasons", 1) > 1 or show_get("number_of_episodes", 1) > 1:
+            episode_set = {
+                "name": show_title,
+                "overview": show_get("overview", "")
+            }
+        else:
+            episode_set = None  # No set by default
 
         # Create episode NFO without hardcoded adult content
+        # Tags come from show data keywords (use translated Chinese tags if available)
         episode_nfo = EpisodeNfo(
             title=episode_name,
-            originaltitle=episode_data.get('name', ''),
+            originaltitle=episode_get('name', ''),
             sorttitle=episode_name,  # Use only episode name for sorttitle
             year=year,
             premiered=premiered,
@@ -134,67 +149,47 @@ class DirectMapper:
             credits=episode_writers,
             director=episode_directors,
             actor=cast,
-            set=None,  # No set by default
-            tags=[],  # Empty tags list by default
+            set=episode_set,
+            tags=show_get("keywords_zh", show_get("keywords", _NO_ITEMS)),
             thumb=episode_thumb_filename,
             fanart=episode_fanart_filename,
             num="",  # Empty product number
             website=""  # Empty website
         )
 
-        # Only add set information for TV shows with multiple episodes/seasons
-        if show_data.get("number_of_seasons", 1) > 1 or show_data.get("number_of_episodes", 1) > 1:
-            episode_nfo.set = {
-                "name": show_title,
-                "overview": show_data.get("overview", "")
-            }
-
-        # Add tags from show data keywords (use translated Chinese tags if available)
-        episode_nfo.tags = show_data.get("keywords_zh", show_data.get("keywords", []))
-
         return episode_nfo
 
     @staticmethod
     def _format_cast(cast_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format cast list for NFO with extended information."""
-        formatted_cast = []
-        for actor in cast_list[:10]:  # Limit to top 10 actors
-            # Format name with both Chinese and English if available
-            name_zh = actor.get('name_zh')
-            name_en = actor.get('name_en', '')
-            original_name = actor.get('original_name', '')
-
-            # Create bilingual name format
-            if name_zh and name_zh != name_en:
-                display_name = f"{name_zh} / {name_en}"
-            else:
-                display_name = name_en
-
-            # Format role with both Chinese and English if available
-            role = actor.get('role', '')
-
-            actor_info = {
-                "name": display_name,
-                "role": role
-            }
+        # Limit to top 10 actors
+        return [DirectMapper._build_actor(actor) for actor in islice(cast_list, 10)]
 
-            # Add original name if different from display name
-            if original_name and original_name != name_en and original_name != name_zh:
-                actor_info["originalname"] = original_name
-
-            # Add profile path for actor image (directly in root directory)
-            profile_path = actor.get('profile_path', '')
-            if profile_path:
-                # Convert TMDB path to local path (match artwork.py naming convention)
-                actor_name_clean = "".join(c for c in name_en if c.isalnum() or c in ' _-').strip()
-                actor_name_clean = actor_name_clean.replace(' ', '_')  # Use underscores like artwork.py
-                if not actor_name_clean:
-                    actor_name_clean = "unknown"
-                # Use direct filename (actor images in root directory)
-                actor_info["thumb"] = f"{actor_name_clean}.jpg"
-
-            formatted_cast.append(actor_info)
-        return formatted_cast
+    @staticmethod
+    def _build_actor(actor: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the NFO actor entry for a single cast member."""
+        get = actor.get
+        name_en = get('name_en', '')
+
+        actor_info = {
+            # Create bilingual name format when a distinct Chinese name is available
+            "name": f"{name_zh} / {name_en}" if (name_zh := get('name_zh')) and name_zh != name_en else name_en,
+            "role": get('role', '')
+        }
+
+        # Add original name if different from display name
+        if (original_name := get('original_name', '')) and original_name != name_en and original_name != name_zh:
+            actor_info["originalname"] = original_name
+
+        # Add profile path for actor image (directly in root directory)
+        if get('profile_path', ''):
+            # Convert TMDB path to local path (match artwork.py naming convention)
+            # Same naming as artwork.py
+            actor_name_clean = FileSystemManager.clean_actor_name(name_en) or "unknown"
+            # Use direct filename (actor images in root directory)
+            actor_info["thumb"] = f"{actor_name_clean}.jpg"
+
+        return actor_info
 
 
 # Backward compatibility alias
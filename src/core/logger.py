@@ -5,11 +5,66 @@ A comprehensive logging system that provides both terminal output and detailed l
 """
 
 import os
-import json
+import atexit
+import time
 import logging
+import weakref
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, Any, Optional, Union
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
+from . import jsonutil
+
+
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Loggers whose queue listener is still running; drained by a single exit hook
+_LIVE_LOGGERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_loggers() -> None:
+    """Make sure queued records reach the file even if finalize() is never called."""
+    for live_logger in list(_LIVE_LOGGERS):
+        live_logger._flush_queue()
+
+
+_FILE_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+class _LazyJSON:
+    """Defer JSON serialization of a log argument until a handler formats it."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        return jsonutil.dumps_str(self.data, indent=True)
+
+
+@dataclass(slots=True)
+class ProcessingState:
+    """Per-run processing record written to the summary file by finalize()."""
+    start_time: str
+    input: Dict[str, Any] = field(default_factory=dict)
+    search: Dict[str, Any] = field(default_factory=dict)
+    fetch: Dict[str, Any] = field(default_factory=dict)
+    translate: Dict[str, Any] = field(default_factory=dict)
+    normalize: Dict[str, Any] = field(default_factory=dict)
+    nfo: Dict[str, Any] = field(default_factory=dict)
+    output: Dict[str, Any] = field(default_factory=dict)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    end_time: Optional[str] = None
 
 
 class MetadataLogger:
@@ -36,186 +91,217 @@ class MetadataLogger:
 
         # Setup Python logging
         self.logger = logging.getLogger("MetadataAgent")
-        self.logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-
-        # Remove any existing handlers
-        self.logger.handlers.clear()
+        self.logger.setLevel(_LOG_LEVELS.get(log_level.upper(), logging.INFO))
+
+        # Remove any existing handlers, closing their files so repeated runs don't leak descriptors
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            listener = getattr(handler, "listener", None)
+            if listener is not None:
+                listener.stop()
+                handler.listener = None
+                for target in listener.handlers:
+                    target.close()
+            handler.close()
 
         # File handler - logs everything
-        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        self._file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        self._file_handler.setLevel(logging.DEBUG)
+        self._file_handler.setFormatter(_FILE_FORMATTER)
+
+        # Hand records to a background thread so large debug dumps don't block on disk I/O
+        log_queue = SimpleQueue()
+        self._queue_handler = QueueHandler(log_queue)
+        self._queue_handler.listener = QueueListener(log_queue, self._file_handler, respect_handler_level=True)
+        self._queue_handler.listener.start()
+        self.logger.addHandler(self._queue_handler)
+        _LIVE_LOGGERS.add(self)
 
         # Store processing data for comprehensive logging
-        self.processing_data = {
-            "start_time": datetime.now().isoformat(),
-            "input": {},
-            "search": {},
-            "fetch": {},
-            "translate": {},
-            "normalize": {},
-            "nfo": {},
-            "output": {},
-            "errors": []
-        }
+        self.processing_data = ProcessingState(start_time=datetime.now().isoformat())
 
     def log_input(self, data: Dict[str, Any]) -> None:
         """Log input parameters."""
-        self.processing_data["input"] = data
+        self.processing_data.input = data
 
         if not self.quiet:
-            print("📋 解析输入参数...")
+            lines = ["📋 解析输入参数..."]
             if self.verbose:
-                print(f"   媒体类型: {data.get('media_type', 'unknown')}")
-                print(f"   查询: {data.get('query', 'N/A')}")
-                print(f"   TMDB ID: {data.get('tmdb_id', 'N/A')}")
-                print(f"   输出目录: {data.get('output_dir', 'N/A')}")
+                lines += [
+                    f"   媒体类型: {data.get('media_type', 'unknown')}",
+                    f"   查询: {data.get('query', 'N/A')}",
+                    f"   TMDB ID: {data.get('tmdb_id', 'N/A')}",
+                    f"   输出目录: {data.get('output_dir', 'N/A')}",
+                ]
+            print("\n".join(lines))
 
         self.logger.info("Input parameters parsed")
-        self.logger.debug(f"Input data: {json.dumps(data, ensure_ascii=False, indent=2)}")
+        self.logger.debug("Input data: %s", _LazyJSON(data))
 
     def log_search(self, results: Dict[str, Any], skip_search: bool = False) -> None:
         """Log search results."""
-        self.processing_data["search"] = {"results": results, "skip_search": skip_search}
+        self.processing_data.search = {"results": results, "skip_search": skip_search}
 
-        if not self.quiet:
+        result_count = len(results.get("results", []))
+
+        if self.verbose and not self.quiet:
             if skip_search:
-                if self.verbose:
-                    print("🔍 跳过搜索，直接使用 ID")
+                print("🔍 跳过搜索，直接使用 ID")
             else:
-                result_count = len(results.get("results", []))
-                if self.verbose:
-                    print(f"   找到 {result_count} 个结果")
+                print(f"   找到 {result_count} 个结果")
 
-        self.logger.info(f"Search completed: {len(results.get('results', []))} results")
-        self.logger.debug(f"Search results: {json.dumps(results, ensure_ascii=False, indent=2)}")
+        self.logger.info("Search completed: %d results", result_count)
+        self.logger.debug("Search results: %s", _LazyJSON(results))
 
     def log_fetch(self, source_data: Dict[str, Any]) -> None:
         """Log fetched data from APIs."""
-        self.processing_data["fetch"] = source_data
+        main_data = source_data.get("main", {})
+        credits_data = source_data.get("credits", {})
+        keywords_data = source_data.get("keywords", {})
+        episodes_data = source_data.get("episodes") or []
+
+        media_type = "tv" if episodes_data else "movie"
+        title = main_data.get("name", main_data.get("title", "Unknown"))
+        cast_count = len(credits_data.get("cast", []))
+        # Handle different keyword formats
+        keywords_list = keywords_data.get("keywords", []) or keywords_data.get("results", [])
+        season_count = sum(1 for s in source_data.get("seasons") or [] if s.get("season_number", 0) > 0)
+
+        # Keep only a summary; the full payload goes to the debug log below
+        self.processing_data.fetch = {
+            "media_type": media_type,
+            "tmdb_id": main_data.get("id"),
+            "title": title,
+            "cast_count": cast_count,
+            "keyword_count": len(keywords_list),
+            "season_count": season_count,
+            "episode_count": len(episodes_data),
+            "has_omdb": bool(source_data.get("omdb")),
+        }
 
         if not self.quiet:
-            main_data = source_data.get("main", {})
-            credits_data = source_data.get("credits", {})
-            keywords_data = source_data.get("keywords", {})
-
-            media_type = "tv" if source_data.get("episodes") else "movie"
-            title = main_data.get("name", main_data.get("title", "Unknown"))
-            print(f"📥 获取 {media_type} 数据 (TMDB ID: {main_data.get('id', 'N/A')})")
+            lines = [f"📥 获取 {media_type} 数据 (TMDB ID: {main_data.get('id', 'N/A')})"]
 
             if self.verbose:
-                print(f"   标题: {title}")
-                cast_count = len(credits_data.get("cast", []))
-                print(f"   演员数量: {cast_count}")
-
-                # Handle different keyword formats
-                keywords_list = keywords_data.get("keywords", []) or keywords_data.get("results", [])
-                print(f"   关键词数量: {len(keywords_list)}")
+                lines += [
+                    f"   标题: {title}",
+                    f"   演员数量: {cast_count}",
+                    f"   关键词数量: {len(keywords_list)}",
+                ]
 
                 if media_type == "tv":
-                    episodes_data = source_data.get("episodes", [])
-                    seasons_data = source_data.get("seasons", [])
-                    season_count = len([s for s in seasons_data if s.get("season_number", 0) > 0])
-                    print(f"   季数量: {season_count}")
-                    print(f"   总集数: {len(episodes_data)}")
+                    lines += [
+                        f"   季数量: {season_count}",
+                        f"   总集数: {len(episodes_data)}",
+                    ]
+            print("\n".join(lines))
 
         # Log full metadata to file
         self.logger.info("Data fetching completed")
-        self.logger.debug(f"Main data: {json.dumps(source_data.get('main', {}), ensure_ascii=False, indent=2)}")
-        self.logger.debug(f"Credits data: {json.dumps(source_data.get('credits', {}), ensure_ascii=False, indent=2)}")
-        self.logger.debug(f"Keywords data: {json.dumps(source_data.get('keywords', {}), ensure_ascii=False, indent=2)}")
+        self.logger.debug("Main data: %s", _LazyJSON(source_data.get('main', {})))
+        self.logger.debug("Credits data: %s", _LazyJSON(source_data.get('credits', {})))
+        self.logger.debug("Keywords data: %s", _LazyJSON(source_data.get('keywords', {})))
 
         if source_data.get("episodes"):
-            self.logger.debug(f"Episodes data: {json.dumps(source_data.get('episodes', []), ensure_ascii=False, indent=2)}")
+            self.logger.debug("Episodes data: %s", _LazyJSON(source_data.get('episodes', [])))
         if source_data.get("seasons"):
-            self.logger.debug(f"Seasons data: {json.dumps(source_data.get('seasons', []), ensure_ascii=False, indent=2)}")
+            self.logger.debug("Seasons data: %s", _LazyJSON(source_data.get('seasons', [])))
         if source_data.get("omdb"):
-            self.logger.debug(f"OMDB data: {json.dumps(source_data.get('omdb', {}), ensure_ascii=False, indent=2)}")
+            self.logger.debug("OMDB data: %s", _LazyJSON(source_data.get('omdb', {})))
 
     def log_translate(self, translated_data: Dict[str, Any], episodes_data: Optional[list] = None) -> None:
         """Log translation results."""
-        self.processing_data["translate"] = {
-            "translated": translated_data,
-            "episodes": episodes_data
+        self.processing_data.translate = {
+            "title": translated_data.get("title"),
+            "title_zh": translated_data.get("title_zh"),
+            "episode_count": len(episodes_data) if episodes_data else 0
         }
 
         if not self.quiet:
-            print("🌐 处理元数据语言...")
+            lines = ["🌐 处理元数据语言..."]
             if self.verbose:
-                print("   📊 标准化数据:")
-                print(f"     标题: {translated_data.get('title', 'N/A')}")
-                print(f"     中文标题: {translated_data.get('title_zh', 'N/A')}")
-                print(f"     英文关键词: {translated_data.get('keywords', 'N/A')}")
+                lines += [
+                    "   📊 标准化数据:",
+                    f"     标题: {translated_data.get('title', 'N/A')}",
+                    f"     中文标题: {translated_data.get('title_zh', 'N/A')}",
+                    f"     英文关键词: {translated_data.get('keywords', 'N/A')}",
+                ]
 
                 if episodes_data:
-                    print(f"   翻译 {len(episodes_data)} 个剧集标题...")
+                    lines.append(f"   翻译 {len(episodes_data)} 个剧集标题...")
+            print("\n".join(lines))
 
         self.logger.info("Translation processing completed")
-        self.logger.debug(f"Translated data: {json.dumps(translated_data, ensure_ascii=False, indent=2)}")
+        self.logger.debug("Translated data: %s", _LazyJSON(translated_data))
         if episodes_data:
-            self.logger.debug(f"Translated episodes: {json.dumps(episodes_data, ensure_ascii=False, indent=2)}")
+            self.logger.debug("Translated episodes: %s", _LazyJSON(episodes_data))
 
     def log_normalize(self, normalized_data: Dict[str, Any]) -> None:
         """Log normalization results."""
-        self.processing_data["normalize"] = normalized_data
+        self.processing_data.normalize = normalized_data
 
         if not self.quiet and self.verbose:
-            print("🔧 数据标准化...")
-            print("   📋 标准化结果:")
-            print(f"     最终标题: {normalized_data.get('title_zh', normalized_data.get('title', 'N/A'))}")
-            print(f"     最终关键词: {normalized_data.get('keywords', 'N/A')}")
-            print(f"     演员数量: {len(normalized_data.get('cast', []))}")
-            print(f"     导演: {normalized_data.get('directors', 'N/A')}")
-            print(f"     类型: {normalized_data.get('genres_zh', normalized_data.get('genres', 'N/A'))}")
+            print("\n".join([
+                "🔧 数据标准化...",
+                "   📋 标准化结果:",
+                f"     最终标题: {normalized_data.get('title_zh', normalized_data.get('title', 'N/A'))}",
+                f"     最终关键词: {normalized_data.get('keywords', 'N/A')}",
+                f"     演员数量: {len(normalized_data.get('cast', []))}",
+                f"     导演: {normalized_data.get('directors', 'N/A')}",
+                f"     类型: {normalized_data.get('genres_zh', normalized_data.get('genres', 'N/A'))}",
+            ]))
 
         self.logger.info("Data normalization completed")
-        self.logger.debug(f"Normalized data: {json.dumps(normalized_data, ensure_ascii=False, indent=2)}")
+        self.logger.debug("Normalized data: %s", _LazyJSON(normalized_data))
 
     def log_nfo(self, nfo_data: Dict[str, Any], xml_content: Optional[str] = None) -> None:
         """Log NFO generation results."""
-        self.processing_data["nfo"] = {"data": nfo_data, "xml": xml_content}
+        self.processing_data.nfo = {
+            "title": nfo_data.get("title"),
+            "year": nfo_data.get("year"),
+            "xml_length": len(xml_content) if xml_content else 0
+        }
 
         if not self.quiet and self.verbose:
-            print("📝 映射到NFO格式...")
-            print("   📋 NFO数据结构:")
-            print(f"     标题: {nfo_data.get('title', 'N/A')}")
-            print(f"     年份: {nfo_data.get('year', 'N/A')}")
-            print(f"     类型: {nfo_data.get('genre', 'N/A')}")
-            print(f"     标签: {nfo_data.get('tags', 'N/A')}")
+            print("\n".join([
+                "📝 映射到NFO格式...",
+                "   📋 NFO数据结构:",
+                f"     标题: {nfo_data.get('title', 'N/A')}",
+                f"     年份: {nfo_data.get('year', 'N/A')}",
+                f"     类型: {nfo_data.get('genre', 'N/A')}",
+                f"     标签: {nfo_data.get('tags', 'N/A')}",
+            ]))
 
         self.logger.info("NFO generation completed")
-        self.logger.debug(f"NFO data: {json.dumps(nfo_data, ensure_ascii=False, indent=2)}")
+        self.logger.debug("NFO data: %s", _LazyJSON(nfo_data))
         if xml_content:
-            self.logger.debug(f"NFO XML content:\n{xml_content}")
+            self.logger.debug("NFO XML content:\n%s", xml_content)
 
     def log_output(self, output_data: Dict[str, Any]) -> None:
         """Log final output results."""
-        self.processing_data["output"] = output_data
+        self.processing_data.output = output_data
 
         if not self.quiet:
-            print("💾 写入输出文件...")
+            lines = ["💾 写入输出文件..."]
 
             files_created = output_data.get("files", {})
             if files_created.get("media_dir"):
-                print(f"   媒体目录: {files_created['media_dir']}")
+                lines.append(f"   媒体目录: {files_created['media_dir']}")
             if files_created.get("nfo_file"):
-                print(f"   NFO 文件: {files_created['nfo_file']}")
+                lines.append(f"   NFO 文件: {files_created['nfo_file']}")
 
             if self.verbose:
-                print(f"   创建了 {len(files_created)} 个文件/目录")
+                lines.append(f"   创建了 {len(files_created)} 个文件/目录")
+            print("\n".join(lines))
 
         self.logger.info("Output generation completed")
-        self.logger.debug(f"Output data: {json.dumps(output_data, ensure_ascii=False, indent=2)}")
+        self.logger.debug("Output data: %s", _LazyJSON(output_data))
 
     def log_error(self, error: Union[str, Exception]) -> None:
         """Log errors."""
         error_msg = str(error)
-        self.processing_data["errors"].append({
-            "timestamp": datetime.now().isoformat(),
+        self.processing_data.errors.append({
+            "timestamp": time.time(),  # formatted in finalize()
             "error": error_msg
         })
 
@@ -236,7 +322,7 @@ class MetadataLogger:
 
     def finalize(self) -> str:
         """Finalize logging and return log file path."""
-        self.processing_data["end_time"] = datetime.now().isoformat()
+        self.processing_data.end_time = datetime.now().isoformat()
 
         # Write complete processing data to log file
         self.logger.info("=== PROCESSING SUMMARY ===")
@@ -246,10 +332,27 @@ class MetadataLogger:
         # Write full processing data as JSON
         try:
             summary_file = self.log_dir / f"processing_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(self.processing_data, f, ensure_ascii=False, indent=2)
+            summary = {f.name: getattr(self.processing_data, f.name) for f in fields(ProcessingState)}
+            summary["errors"] = [
+                {**error, "timestamp": datetime.fromtimestamp(error["timestamp"]).isoformat()}
+                for error in self.processing_data.errors
+            ]
+            with open(summary_file, 'wb') as f:
+                f.write(jsonutil.dumps(summary, indent=True))
             self.logger.info(f"Processing summary saved to: {summary_file}")
         except Exception as e:
             self.logger.error(f"Failed to save processing summary: {e}")
 
+        self._flush_queue()
         return str(self.log_file)
+
+    def _flush_queue(self) -> None:
+        """Drain queued records to the log file and switch to writing it directly."""
+        listener = self._queue_handler.listener
+        if listener is None:
+            return
+        listener.stop()
+        self._queue_handler.listener = None
+        _LIVE_LOGGERS.discard(self)
+        self.logger.removeHandler(self._queue_handler)
+        self.logger.addHandler(self._file_handler)
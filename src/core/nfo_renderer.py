@@ -1,69 +1,120 @@
-import xml.etree.ElementTree as ET
 from typing import Dict, Any, Union, Optional
-from xml.dom import minidom
+from xml.sax.saxutils import escape
 from .schema_nfo import MovieNfo, TvShowNfo, EpisodeNfo
 
+# minidom also escapes double quotes in text; keep the same output
+_QUOTE_ENTITY = {'"': "&quot;"}
 
-class NfoRenderer:
-    @staticmethod
-    def _create_element(parent: ET.Element, tag: str, text: Any = None) -> ET.Element:
-        """Create XML element with optional text."""
-        element = ET.SubElement(parent, tag)
-        if text is not None:
-            if isinstance(text, str):
-                element.text = text
-            else:
-                element.text = str(text)
-        return element
 
-    @staticmethod
-    def _create_cdata_element(parent: ET.Element, tag: str, text: str) -> ET.Element:
-        """Create XML element with CDATA content."""
-        element = ET.SubElement(parent, tag)
-        # Manually create CDATA by setting the text with CDATA markers
-        # We'll handle the proper CDATA formatting in the final XML output
-        element.text = f"CDATA_PLACEHOLDER_{len(text)}_{hash(text)}"
-        element.set("cdata_content", text)
-        return element
+class _StreamingNfoWriter:
+    """Write pretty-printed NFO XML directly, without building an element tree.
 
-    @staticmethod
-    def _add_list_elements(parent: ET.Element, tag: str, items: list) -> None:
-        """Add multiple elements for a list."""
+    The layout matches minidom's toprettyxml(indent="  "): one element per line,
+    text inline, and childless elements self-closed as <tag/>.
+    """
+
+    __slots__ = ("_parts", "_stack", "_pending")
+
+    def __init__(self, root_tag: str):
+        self._parts = ['<?xml version="1.0" ?>\n']
+        self._stack = []
+        self._pending = False
+        self.open(root_tag)
+
+    def _start_child(self) -> str:
+        """Finish a pending open tag and return the indent for the next child."""
+        if self._pending:
+            self._parts.append(">\n")
+            self._pending = False
+        return "  " * len(self._stack)
+
+    def open(self, tag: str) -> None:
+        """Open an element that will contain child elements."""
+        self._parts.append(f"{self._start_child()}<{tag}")
+        self._stack.append(tag)
+        self._pending = True
+
+    def close(self) -> None:
+        """Close the innermost open element."""
+        tag = self._stack.pop()
+        if self._pending:
+            self._parts.append("/>\n")
+            self._pending = False
+        else:
+            self._parts.append(f"{'  ' * len(self._stack)}</{tag}>\n")
+
+    def text(self, tag: str, value: Any = None, attrs: Optional[Dict[str, str]] = None) -> None:
+        """Write an element with optional text and attributes."""
+        parts = self._parts
+        parts.append(f"{self._start_child()}<{tag}")
+        if attrs:
+            for name, attr_value in attrs.items():
+                parts.append(f' {name}="{escape(attr_value, _QUOTE_ENTITY)}"')
+        if value is not None:
+            value = value if isinstance(value, str) else str(value)
+        if value:
+            parts.append(f">{escape(value, _QUOTE_ENTITY)}</{tag}>\n")
+        else:
+            parts.append("/>\n")
+
+    def cdata(self, tag: str, value: str) -> None:
+        """Write an element whose text is a CDATA section."""
+        # A literal "]]>" would end the section early, so split it across two sections
+        value = value.replace("]]>", "]]]]><![CDATA[>")
+        self._parts.append(f"{self._start_child()}<{tag}><![CDATA[{value}]]></{tag}>\n")
+
+    def list_(self, tag: str, items: list) -> None:
+        """Write one element per item."""
+        if not items:
+            return
+        indent = self._start_child()
+        append = self._parts.append
         for item in items:
-            NfoRenderer._create_element(parent, tag, item)
+            if item is not None and not isinstance(item, str):
+                item = str(item)
+            if item:
+                append(f"{indent}<{tag}>{escape(item, _QUOTE_ENTITY)}</{tag}>\n")
+            else:
+                append(f"{indent}<{tag}/>\n")
 
+    def getvalue(self) -> str:
+        """Close any open elements and return the document."""
+        while self._stack:
+            self.close()
+        return "".join(self._parts)
+
+
+class NfoRenderer:
     @staticmethod
-    def _add_combined_credits(parent: ET.Element, credits_list: list) -> None:
+    def _add_combined_credits(writer: _StreamingNfoWriter, credits_list: list) -> None:
         """Add combined credits element."""
         if credits_list:
             combined_credits = ", ".join(credits_list)
-            NfoRenderer._create_element(parent, "credits", combined_credits)
+            writer.text("credits", combined_credits)
 
     @staticmethod
-    def _add_actor_elements(parent: ET.Element, actors: list, media_type: str = "movie") -> None:
+    def _add_actor_elements(writer: _StreamingNfoWriter, actors: list, media_type: str = "movie") -> None:
         """Add actor elements with name, role, and additional info."""
+        # Actor thumbs are now directly in root directory as filenames.
+        # For TV episodes in Season directories, go up one level to reach root;
+        # for movies in root directory, use filename directly.
+        thumb_prefix = "../" if media_type == "tv" else ""
         for actor in actors:
             if isinstance(actor, dict):
-                actor_elem = ET.SubElement(parent, "actor")
-                NfoRenderer._create_element(actor_elem, "name", actor.get("name", ""))
-                NfoRenderer._create_element(actor_elem, "role", actor.get("role", ""))
-                NfoRenderer._create_element(actor_elem, "type", "Actor")  # Add type for Emby compatibility
+                writer.open("actor")
+                writer.text("name", actor.get("name", ""))
+                writer.text("role", actor.get("role", ""))
+                writer.text("type", "Actor")  # Add type for Emby compatibility
 
                 # Add original name if available
                 if actor.get("originalname"):
-                    NfoRenderer._create_element(actor_elem, "originalname", actor["originalname"])
+                    writer.text("originalname", actor["originalname"])
 
                 # Add actor thumb with proper path based on media type
-                # Actor thumbs are now directly in root directory as filenames
                 if actor.get("thumb"):
-                    thumb_path = actor["thumb"]  # Now just filename like "Saya_Aizawa.jpg"
-
-                    # For TV episodes in Season directories, go up one level to reach root
-                    if media_type == "tv":
-                        thumb_path = f"../{thumb_path}"
-                    # For movies in root directory, use filename directly
-
-                    NfoRenderer._create_element(actor_elem, "thumb", thumb_path)
+                    # Thumb is just a filename like "Saya_Aizawa.jpg"
+                    writer.text("thumb", thumb_prefix + actor["thumb"])
+                writer.close()
 
     @staticmethod
     def _normalize_image_path(image_path: str) -> str:
@@ -93,285 +144,162 @@ class NfoRenderer:
         return image_path
 
     @staticmethod
-    def render_movie_nfo(nfo: MovieNfo, tmdb_id: Optional[int] = None) -> str:
-        """Render MovieNfo to XML string."""
-        root = ET.Element("movie")
-
-        NfoRenderer._create_element(root, "title", nfo.title)
+    def _add_common_fields(writer: _StreamingNfoWriter, nfo: Union[MovieNfo, TvShowNfo],
+                           tmdb_id: Optional[int], media_type: str) -> None:
+        """Add the leading fields shared by movie and tvshow NFOs, up to the cast."""
+        writer.text("title", nfo.title)
         if nfo.originaltitle:
-            NfoRenderer._create_element(root, "originaltitle", nfo.originaltitle)
-        NfoRenderer._create_element(root, "year", nfo.year)
+            writer.text("originaltitle", nfo.originaltitle)
+        writer.text("year", nfo.year)
         if nfo.premiered:
-            NfoRenderer._create_element(root, "premiered", nfo.premiered)
+            writer.text("premiered", nfo.premiered)
         if nfo.plot:
-            NfoRenderer._create_cdata_element(root, "plot", nfo.plot)
+            writer.cdata("plot", nfo.plot)
         if nfo.tagline:
-            NfoRenderer._create_element(root, "tagline", nfo.tagline)
+            writer.text("tagline", nfo.tagline)
         if nfo.runtime:
-            NfoRenderer._create_element(root, "runtime", nfo.runtime)
+            writer.text("runtime", nfo.runtime)
         if nfo.rating:
-            NfoRenderer._create_element(root, "rating", nfo.rating)
+            writer.text("rating", nfo.rating)
         if nfo.votes:
-            NfoRenderer._create_element(root, "votes", nfo.votes)
+            writer.text("votes", nfo.votes)
 
         # Add TMDB ID if provided
         if tmdb_id:
-            NfoRenderer._create_element(root, "tmdbid", str(tmdb_id))
-
-        NfoRenderer._add_list_elements(root, "genre", nfo.genre)
-        NfoRenderer._add_list_elements(root, "country", nfo.country)
-        NfoRenderer._add_list_elements(root, "studio", nfo.studio)
-        NfoRenderer._add_combined_credits(root, nfo.credits)
-        NfoRenderer._add_list_elements(root, "director", nfo.director)
-        NfoRenderer._add_actor_elements(root, nfo.actor, "movie")
+            writer.text("tmdbid", str(tmdb_id))
 
-        # Add network if available (only for TV shows)
-        if isinstance(nfo, TvShowNfo) and hasattr(nfo, 'network') and nfo.network:
-            NfoRenderer._create_element(root, "network", nfo.network)
+        writer.list_("genre", nfo.genre)
+        writer.list_("country", nfo.country)
+        writer.list_("studio", nfo.studio)
+        NfoRenderer._add_combined_credits(writer, nfo.credits)
+        writer.list_("director", nfo.director)
+        NfoRenderer._add_actor_elements(writer, nfo.actor, media_type)
 
+    @staticmethod
+    def _add_common_trailer(writer: _StreamingNfoWriter, nfo: Union[MovieNfo, TvShowNfo]) -> None:
+        """Add the uniqueid, image and tag fields shared by movie and tvshow NFOs."""
         # Add uniqueid for TMDB
-        if hasattr(nfo, 'tmdb_id') and nfo.tmdb_id:
-            uniqueid_elem = ET.SubElement(root, "uniqueid")
-            uniqueid_elem.text = str(nfo.tmdb_id)
-            uniqueid_elem.set("type", "tmdb")
-            uniqueid_elem.set("default", "true")
+        nfo_tmdb_id = getattr(nfo, 'tmdb_id', None)
+        if nfo_tmdb_id:
+            writer.text("uniqueid", str(nfo_tmdb_id), {"type": "tmdb", "default": "true"})
 
         # Use Emby standard image paths (relative to NFO location)
         thumb_path = "poster.jpg"
         fanart_path = "fanart.jpg"
 
-        NfoRenderer._create_element(root, "thumb", thumb_path)
-        NfoRenderer._create_element(root, "fanart", fanart_path)
+        writer.text("thumb", thumb_path)
+        writer.text("fanart", fanart_path)
 
         # Add tags
-        for tag in nfo.tags:
-            NfoRenderer._create_element(root, "tag", tag)
-
-        # Pretty print XML
-        rough_string = ET.tostring(root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        xml_string = reparsed.toprettyxml(indent="  ")
-
-        # Replace CDATA placeholders with actual CDATA sections and remove cdata_content attributes
-        import re
-        lines = xml_string.split('\n')
-        new_lines = []
-
-        for line in lines:
-            # Remove cdata_content attributes
-            line = re.sub(r'\s+cdata_content="[^"]*"', '', line)
-
-            # Replace CDATA placeholders with actual CDATA
-            cdata_match = re.search(r'CDATA_PLACEHOLDER_(\d+)_(-?\d+)', line)
-            if cdata_match:
-                # Find the corresponding element to get the content
-                for elem in root.iter():
-                    cdata_content = elem.get("cdata_content")
-                    if cdata_content:
-                        content_len = len(cdata_content)
-                        content_hash = hash(cdata_content)
-                        if str(content_len) == cdata_match.group(1) and str(content_hash) == cdata_match.group(2):
-                            line = line.replace(f'CDATA_PLACEHOLDER_{content_len}_{content_hash}', f'<![CDATA[{cdata_content}]]>')
-                            break
-
-            new_lines.append(line)
-
-        return '\n'.join(new_lines)
+        writer.list_("tag", nfo.tags)
 
     @staticmethod
-    def render_tvshow_nfo(nfo: TvShowNfo, tmdb_id: Optional[int] = None) -> str:
-        """Render TvShowNfo to XML string."""
-        root = ET.Element("tvshow")
+    def render_movie_nfo(nfo: MovieNfo, tmdb_id: Optional[int] = None) -> str:
+        """Render MovieNfo to XML string."""
+        writer = _StreamingNfoWriter("movie")
 
-        NfoRenderer._create_element(root, "title", nfo.title)
-        if nfo.originaltitle:
-            NfoRenderer._create_element(root, "originaltitle", nfo.originaltitle)
-        NfoRenderer._create_element(root, "year", nfo.year)
-        if nfo.premiered:
-            NfoRenderer._create_element(root, "premiered", nfo.premiered)
-        if nfo.plot:
-            NfoRenderer._create_cdata_element(root, "plot", nfo.plot)
-        if nfo.tagline:
-            NfoRenderer._create_element(root, "tagline", nfo.tagline)
-        if nfo.runtime:
-            NfoRenderer._create_element(root, "runtime", nfo.runtime)
-        if nfo.rating:
-            NfoRenderer._create_element(root, "rating", nfo.rating)
-        if nfo.votes:
-            NfoRenderer._create_element(root, "votes", nfo.votes)
+        NfoRenderer._add_common_fields(writer, nfo, tmdb_id, "movie")
 
-        # Add TMDB ID if provided
-        if tmdb_id:
-            NfoRenderer._create_element(root, "tmdbid", str(tmdb_id))
+        # Add network if available (only for TV shows)
+        if isinstance(nfo, TvShowNfo) and nfo.network:
+            writer.text("network", nfo.network)
+
+        NfoRenderer._add_common_trailer(writer, nfo)
+        return writer.getvalue()
 
-        NfoRenderer._add_list_elements(root, "genre", nfo.genre)
-        NfoRenderer._add_list_elements(root, "country", nfo.country)
-        NfoRenderer._add_list_elements(root, "studio", nfo.studio)
-        NfoRenderer._add_combined_credits(root, nfo.credits)
-        NfoRenderer._add_list_elements(root, "director", nfo.director)
-        NfoRenderer._add_actor_elements(root, nfo.actor, "tv")
+    @staticmethod
+    def render_tvshow_nfo(nfo: TvShowNfo, tmdb_id: Optional[int] = None) -> str:
+        """Render TvShowNfo to XML string."""
+        writer = _StreamingNfoWriter("tvshow")
+
+        NfoRenderer._add_common_fields(writer, nfo, tmdb_id, "tv")
 
         # Add all networks (for TV shows)
-        if hasattr(nfo, 'networks') and nfo.networks:
-            for network in nfo.networks:
-                NfoRenderer._create_element(root, "network", network)
-        elif hasattr(nfo, 'network') and nfo.network:
+        networks = getattr(nfo, 'networks', None)
+        if networks:
+            writer.list_("network", networks)
+        elif network := getattr(nfo, 'network', None):
             # Fallback to single network
-            NfoRenderer._create_element(root, "network", nfo.network)
+            writer.text("network", network)
 
         # Add status for TV shows
-        if hasattr(nfo, 'status') and nfo.status:
-            NfoRenderer._create_element(root, "status", nfo.status)
+        if status := getattr(nfo, 'status', None):
+            writer.text("status", status)
 
         # Add homepage
-        if hasattr(nfo, 'homepage') and nfo.homepage:
-            NfoRenderer._create_element(root, "homepage", nfo.homepage)
+        if homepage := getattr(nfo, 'homepage', None):
+            writer.text("homepage", homepage)
 
-        # Add uniqueid for TMDB
-        if hasattr(nfo, 'tmdb_id') and nfo.tmdb_id:
-            uniqueid_elem = ET.SubElement(root, "uniqueid")
-            uniqueid_elem.text = str(nfo.tmdb_id)
-            uniqueid_elem.set("type", "tmdb")
-            uniqueid_elem.set("default", "true")
-
-        # Use Emby standard image paths (relative to NFO location)
-        thumb_path = "poster.jpg"
-        fanart_path = "fanart.jpg"
-
-        NfoRenderer._create_element(root, "thumb", thumb_path)
-        NfoRenderer._create_element(root, "fanart", fanart_path)
-
-        # Add tags
-        for tag in nfo.tags:
-            NfoRenderer._create_element(root, "tag", tag)
-
-        # Pretty print XML and fix CDATA
-        rough_string = ET.tostring(root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        xml_string = reparsed.toprettyxml(indent="  ")
-
-        # Replace CDATA placeholders with actual CDATA sections and remove cdata_content attributes
-        import re
-        lines = xml_string.split('\n')
-        new_lines = []
-
-        for line in lines:
-            # Remove cdata_content attributes
-            line = re.sub(r'\s+cdata_content="[^"]*"', '', line)
-
-            # Replace CDATA placeholders with actual CDATA
-            cdata_match = re.search(r'CDATA_PLACEHOLDER_(\d+)_(-?\d+)', line)
-            if cdata_match:
-                # Find the corresponding element to get the content
-                for elem in root.iter():
-                    cdata_content = elem.get("cdata_content")
-                    if cdata_content:
-                        content_len = len(cdata_content)
-                        content_hash = hash(cdata_content)
-                        if str(content_len) == cdata_match.group(1) and str(content_hash) == cdata_match.group(2):
-                            line = line.replace(f'CDATA_PLACEHOLDER_{content_len}_{content_hash}', f'<![CDATA[{cdata_content}]]>')
-                            break
-
-            new_lines.append(line)
-
-        return '\n'.join(new_lines)
+        NfoRenderer._add_common_trailer(writer, nfo)
+        return writer.getvalue()
 
     @staticmethod
     def render_episode_nfo(nfo: EpisodeNfo) -> str:
         """Render EpisodeNfo to XML string using episodedetails format."""
-        root = ET.Element("episodedetails")
+        writer = _StreamingNfoWriter("episodedetails")
 
-        NfoRenderer._create_element(root, "title", nfo.title)
+        writer.text("title", nfo.title)
         if nfo.originaltitle:
-            NfoRenderer._create_element(root, "originaltitle", nfo.originaltitle)
+            writer.text("originaltitle", nfo.originaltitle)
         if nfo.sorttitle:
-            NfoRenderer._create_element(root, "sorttitle", nfo.sorttitle)
-        NfoRenderer._create_element(root, "year", nfo.year)
+            writer.text("sorttitle", nfo.sorttitle)
+        writer.text("year", nfo.year)
         if nfo.premiered:
-            NfoRenderer._create_element(root, "premiered", nfo.premiered)
-            NfoRenderer._create_element(root, "aired", nfo.premiered)  # Add aired field for episodes
+            writer.text("premiered", nfo.premiered)
+            writer.text("aired", nfo.premiered)  # Add aired field for episodes
         if nfo.runtime:
-            NfoRenderer._create_element(root, "runtime", nfo.runtime)
+            writer.text("runtime", nfo.runtime)
         if nfo.plot:
-            NfoRenderer._create_cdata_element(root, "plot", nfo.plot)
+            writer.cdata("plot", nfo.plot)
         if nfo.outline:
-            NfoRenderer._create_cdata_element(root, "outline", nfo.outline)
+            writer.cdata("outline", nfo.outline)
         if nfo.rating:
-            NfoRenderer._create_element(root, "rating", nfo.rating)
+            writer.text("rating", nfo.rating)
         if nfo.votes:
-            NfoRenderer._create_element(root, "votes", nfo.votes)
+            writer.text("votes", nfo.votes)
         if nfo.mpaa:
-            NfoRenderer._create_element(root, "mpaa", nfo.mpaa)
+            writer.text("mpaa", nfo.mpaa)
 
-        NfoRenderer._add_list_elements(root, "genre", nfo.genre)
-        NfoRenderer._add_list_elements(root, "country", nfo.country)
-        NfoRenderer._add_list_elements(root, "studio", nfo.studio)
+        writer.list_("genre", nfo.genre)
+        writer.list_("country", nfo.country)
+        writer.list_("studio", nfo.studio)
         if nfo.label:
-            NfoRenderer._create_element(root, "label", nfo.label)
-        NfoRenderer._add_list_elements(root, "credits", nfo.credits)
-        NfoRenderer._add_list_elements(root, "director", nfo.director)
-        NfoRenderer._add_actor_elements(root, nfo.actor, "tv")  # Episodes are part of TV shows
+            writer.text("label", nfo.label)
+        writer.list_("credits", nfo.credits)
+        writer.list_("director", nfo.director)
+        NfoRenderer._add_actor_elements(writer, nfo.actor, "tv")  # Episodes are part of TV shows
 
         # Add lockedfields
-        NfoRenderer._create_element(root, "lockedfields", nfo.lockedfields or "Name")
+        writer.text("lockedfields", nfo.lockedfields or "Name")
 
         # Add set information
         if nfo.set:
-            set_elem = ET.SubElement(root, "set")
+            writer.open("set")
             if nfo.set.get("name"):
-                NfoRenderer._create_element(set_elem, "name", nfo.set["name"])
+                writer.text("name", nfo.set["name"])
             if nfo.set.get("overview"):
-                NfoRenderer._create_cdata_element(set_elem, "overview", nfo.set["overview"])
+                writer.cdata("overview", nfo.set["overview"])
+            writer.close()
 
         # Add tags
-        for tag in nfo.tags:
-            NfoRenderer._create_element(root, "tag", tag)
+        writer.list_("tag", nfo.tags)
 
         # Use Emby standard episode image paths
         # Based on Emby community feedback, use relative paths for episode images
         if nfo.thumb:
             # Use the episode-specific thumb file
-            NfoRenderer._create_element(root, "thumb", nfo.thumb)
+            writer.text("thumb", nfo.thumb)
         
         # For fanart, use episode-specific fanart if available, otherwise point to main fanart
         if nfo.fanart:
-            NfoRenderer._create_element(root, "fanart", nfo.fanart)
+            writer.text("fanart", nfo.fanart)
         else:
             # Fallback to main fanart in parent directory
-            NfoRenderer._create_element(root, "fanart", "../fanart.jpg")
+            writer.text("fanart", "../fanart.jpg")
 
         if nfo.num:
-            NfoRenderer._create_element(root, "num", nfo.num)
+            writer.text("num", nfo.num)
         if nfo.website:
-            NfoRenderer._create_element(root, "website", nfo.website)
-
-        # Pretty print XML and fix CDATA
-        rough_string = ET.tostring(root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        xml_string = reparsed.toprettyxml(indent="  ")
-
-        # Replace CDATA placeholders with actual CDATA sections and remove cdata_content attributes
-        import re
-        lines = xml_string.split('\n')
-        new_lines = []
-
-        for line in lines:
-            # Remove cdata_content attributes
-            line = re.sub(r'\s+cdata_content="[^"]*"', '', line)
-
-            # Replace CDATA placeholders with actual CDATA
-            cdata_match = re.search(r'CDATA_PLACEHOLDER_(\d+)_(-?\d+)', line)
-            if cdata_match:
-                # Find the corresponding element to get the content
-                for elem in root.iter():
-                    cdata_content = elem.get("cdata_content")
-                    if cdata_content:
-                        content_len = len(cdata_content)
-                        content_hash = hash(cdata_content)
-                        if str(content_len) == cdata_match.group(1) and str(content_hash) == cdata_match.group(2):
-                            line = line.replace(f'CDATA_PLACEHOLDER_{content_len}_{content_hash}', f'<![CDATA[{cdata_content}]]>')
-                            break
-
-            new_lines.append(line)
-
-        return '\n'.join(new_lines)
+            writer.text("website", nfo.website)
+
+        return writer.getvalue()
@@ -1,21 +1,41 @@
+import re
 from typing import Dict, Any, List, Optional
 from .schema_internal import InternalSchema
 
+# CJK Unified Ideographs, used to detect titles/overviews that are already Chinese
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+_SHOW_WRITER_JOBS = frozenset({"Writer", "Screenplay", "Story", "Series Composition"})
+_EPISODE_WRITER_JOBS = frozenset({"Writer", "Screenplay", "Story"})
+
+
+def _split_csv(value: str) -> List[str]:
+    """Split an OMDB comma-separated field into stripped, non-empty names."""
+    return [token for token in (part.strip() for part in value.split(",")) if token]
+
 
 class DataNormalizer:
+    @staticmethod
+    def _parse_year(date: Optional[str]) -> int:
+        """Return the year of a TMDB "YYYY-MM-DD" date, or 0 if it is missing or malformed."""
+        if date and date[:4].isdigit():
+            return int(date[:4])
+        return 0
+
     @staticmethod
     def normalize_tmdb_movie(data: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize TMDB movie data to internal schema format."""
+        release_date = data.get("release_date")
         normalized = {
             "media_type": "movie",
             "tmdb_id": data.get("id"),
             "title": data.get("title", ""),
             "original_title": data.get("original_title"),
-            "year": int(data.get("release_date", "0000-00-00")[:4]) if data.get("release_date") else 0,
+            "year": DataNormalizer._parse_year(release_date),
             "plot": data.get("overview"),
             "tagline": data.get("tagline"),
             "runtime": data.get("runtime"),
-            "release_date": data.get("release_date"),
+            "release_date": release_date,
             "rating": data.get("vote_average"),
             "rating_count": data.get("vote_count"),
             "genres": [genre["name"] for genre in data.get("genres", [])],
@@ -29,14 +49,13 @@ class DataNormalizer:
         }
 
         # Check if the returned data is already in Chinese
-        import re
         title = data.get("title", "")
         overview = data.get("overview", "")
 
         # If title contains Chinese characters, assume it's already Chinese
-        if re.search(r'[\u4e00-\u9fff]', title):
+        if _CJK_RE.search(title):
             normalized["title_zh"] = title
-        if re.search(r'[\u4e00-\u9fff]', overview):
+        if _CJK_RE.search(overview):
             normalized["plot_zh"] = overview
 
         # Extract additional Chinese translations if available
@@ -58,17 +77,18 @@ class DataNormalizer:
 
         # Extract all networks
         all_networks = [network.get("name", "") for network in networks if network.get("name")]
+        first_air_date = data.get("first_air_date")
 
         normalized = {
             "media_type": "tv",
             "tmdb_id": data.get("id"),
             "title": data.get("name", ""),
             "original_title": data.get("original_name"),
-            "year": int(data.get("first_air_date", "0000-00-00")[:4]) if data.get("first_air_date") else 0,
+            "year": DataNormalizer._parse_year(first_air_date),
             "plot": data.get("overview"),
             "tagline": data.get("tagline"),
             "runtime": data.get("episode_run_time", [0])[0] if data.get("episode_run_time") else None,
-            "release_date": data.get("first_air_date"),
+            "release_date": first_air_date,
             "rating": data.get("vote_average"),
             "rating_count": data.get("vote_count"),
             "genres": [genre["name"] for genre in data.get("genres", [])],
@@ -88,14 +108,13 @@ class DataNormalizer:
         }
 
         # Check if the returned data is already in Chinese
-        import re
         title = data.get("name", "")
         overview = data.get("overview", "")
 
         # If title contains Chinese characters, assume it's already Chinese
-        if re.search(r'[\u4e00-\u9fff]', title):
+        if _CJK_RE.search(title):
             normalized["title_zh"] = title
-        if re.search(r'[\u4e00-\u9fff]', overview):
+        if _CJK_RE.search(overview):
             normalized["plot_zh"] = overview
 
         # Extract additional Chinese translations if available
@@ -111,50 +130,48 @@ class DataNormalizer:
     @staticmethod
     def enrich_with_credits(normalized: Dict[str, Any], credits_data: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich normalized data with credits information."""
-        cast = []
-        for person in credits_data.get("cast", [])[:10]:  # Top 10 cast members
-            cast.append({
+        normalized["cast"] = [
+            {
                 "name_en": person.get("name", ""),
                 "name_zh": None,  # Will be filled by OMDB
                 "role": person.get("character", ""),
                 "original_name": person.get("original_name", ""),
                 "profile_path": person.get("profile_path", ""),
                 "popularity": person.get("popularity", 0)
-            })
-
-        normalized["cast"] = cast
+            }
+            for person in credits_data.get("cast", [])[:10]  # Top 10 cast members
+        ]
 
         # Extract directors and writers from crew
         directors = set()
         writers = set()
-
-        for person in credits_data.get("crew", []):
-            job = person.get("job", "")
-            department = person.get("department", "")
-
-            # Check by job title or department
-            if job == "Director" or department == "Directing":
-                directors.add(person.get("name", ""))
-            elif job in ["Writer", "Screenplay", "Story", "Series Composition"] or department == "Writing":
-                writers.add(person.get("name", ""))
+        DataNormalizer._collect_crew(credits_data.get("crew", []), _SHOW_WRITER_JOBS, directors, writers)
 
         # Also check episode-level crew for TV shows
         if normalized.get("media_type") == "tv" and normalized.get("episodes"):
             for episode in normalized["episodes"]:
-                for person in episode.get("crew", []):
-                    job = person.get("job", "")
-                    department = person.get("department", "")
-
-                    if job == "Director" or department == "Directing":
-                        directors.add(person.get("name", ""))
-                    elif job in ["Writer", "Screenplay", "Story"] or department == "Writing":
-                        writers.add(person.get("name", ""))
+                DataNormalizer._collect_crew(episode.get("crew", []), _EPISODE_WRITER_JOBS, directors, writers)
 
         normalized["directors"] = list(directors)  # Convert set to list
         normalized["writers"] = list(writers)
 
         return normalized
 
+    @staticmethod
+    def _collect_crew(crew: List[Dict[str, Any]], writer_jobs: frozenset, directors: set, writers: set) -> None:
+        """Add director and writer names from a crew list, checking job title or department."""
+        add_director = directors.add
+        add_writer = writers.add
+        for person in crew:
+            get = person.get
+            job = get("job", "")
+            department = get("department", "")
+
+            if job == "Director" or department == "Directing":
+                add_director(get("name", ""))
+            elif job in writer_jobs or department == "Writing":
+                add_writer(get("name", ""))
+
     @staticmethod
     def enrich_with_keywords(normalized: Dict[str, Any], keywords_data: Dict[str, Any], translate: bool = False) -> Dict[str, Any]:
         """Enrich normalized data with keywords information."""
@@ -183,7 +200,7 @@ class DataNormalizer:
 
         # Update cast with Chinese names if available
         if "Actors" in omdb_data and normalized.get("cast"):
-            omdb_actors = [actor.strip() for actor in omdb_data["Actors"].split(",")]
+            omdb_actors = _split_csv(omdb_data["Actors"])
             for i, omdb_actor in enumerate(omdb_actors):
                 if i < len(normalized["cast"]):
                     # Try to match by similarity or just assign sequentially
@@ -193,13 +210,11 @@ class DataNormalizer:
         if "Plot" in omdb_data and not normalized.get("plot_zh"):
             normalized["plot_zh"] = omdb_data["Plot"]
         if "Genre" in omdb_data:
-            omdb_genres = [g.strip() for g in omdb_data["Genre"].split(",")]
-            normalized["genres_zh"] = omdb_genres
+            normalized["genres_zh"] = _split_csv(omdb_data["Genre"])
         if "Director" in omdb_data:
-            omdb_directors = [d.strip() for d in omdb_data["Director"].split(",")]
-            normalized["directors"] = list(set(normalized.get("directors", []) + omdb_directors))
+            # Merge without duplicates, keeping TMDB names first
+            normalized["directors"] = list(dict.fromkeys([*normalized.get("directors", []), *_split_csv(omdb_data["Director"])]))
         if "Writer" in omdb_data:
-            omdb_writers = [w.strip() for w in omdb_data["Writer"].split(",")]
-            normalized["writers"] = list(set(normalized.get("writers", []) + omdb_writers))
+            normalized["writers"] = list(dict.fromkeys([*normalized.get("writers", []), *_split_csv(omdb_data["Writer"])]))
 
         return normalized
@@ -1,8 +1,9 @@
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Literal
-from pydantic import BaseModel
 
 
-class InternalSchema(BaseModel):
+@dataclass(slots=True)
+class InternalSchema:
     media_type: Literal["movie", "tv"]
     tmdb_id: int
     OMDB_id: Optional[str]
@@ -1,8 +1,27 @@
 import os
-import json
+import time
 import hashlib
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from . import jsonutil
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; writes are then only atomic, not serialized
+    fcntl = None
+
+# Number of per-tag lookups memoized by each TagCacheManager
+LOOKUP_CACHE_SIZE = 4096
+# Seconds in a day, for converting cache ages to epoch offsets
+_DAY_SECONDS = 86400
+# Length of the hex keys written before the switch from MD5 to BLAKE2b
+_LEGACY_KEY_LENGTH = 32
+
+
+def _cache_key(tag: str) -> str:
+    """Build the cache key for a tag (case-insensitive)."""
+    return hashlib.blake2b(tag.lower().encode(), digest_size=8).hexdigest()
 
 
 class TagCacheManager:
@@ -11,79 +30,208 @@ class TagCacheManager:
     def __init__(self, cache_dir: str = ".cache"):
         self.cache_dir = cache_dir
         self.tag_cache_file = os.path.join(cache_dir, "tag_translations.json")
+        # Append-only journal of entries written since the last snapshot
+        self.tag_log_file = os.path.join(cache_dir, "tag_translations.log")
+        # Advisory lock file serializing writers across threads and processes
+        self.tag_lock_file = os.path.join(cache_dir, "tag_translations.lock")
         os.makedirs(cache_dir, exist_ok=True)
+        # Per-instance memo so repeated lookups skip hashing
+        self._lookup_single = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
         self._load_cache()
 
     def _load_cache(self) -> None:
         """Load tag translation cache from file."""
+        self.cache, migrated = self._read_disk_state()
+        self._lookup_single.cache_clear()
+        if migrated:
+            self._save_cache()
+
+    def _read_disk_state(self) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """Read the snapshot file and replay the journal on top of it.
+
+        Returns the entries and whether any legacy MD5 keys had to be rehashed.
+        """
+        cache = {}
         if os.path.exists(self.tag_cache_file):
             try:
-                with open(self.tag_cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.cache = {}
-        else:
-            self.cache = {}
+                with open(self.tag_cache_file, 'rb') as f:
+                    cache = jsonutil.loads(f.read())
+            except (ValueError, FileNotFoundError):
+                cache = {}
+        self._replay_log(cache)
+        return cache, self._migrate_legacy_keys(cache)
+
+    def _replay_log(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        """Apply journal entries appended after the snapshot was written."""
+        if not os.path.exists(self.tag_log_file):
+            return
+
+        try:
+            with open(self.tag_log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = jsonutil.loads(line)
+                        cache[entry['k']] = {
+                            'original': entry['o'],
+                            'translation': entry['t'],
+                            'timestamp': entry['ts']
+                        }
+                    except (ValueError, KeyError, TypeError):
+                        # Skip a torn or malformed trailing line
+                        continue
+        except OSError as e:
+            print(f"Failed to read tag cache log: {e}")
+
+    def _merge_disk_state(self) -> None:
+        """Fold in entries other processes wrote since this one loaded; caller holds the lock.
+
+        The newest timestamp wins, so a compaction never drops translations that exist
+        only in the on-disk snapshot or journal.
+        """
+        for key, data in self._read_disk_state()[0].items():
+            current = self.cache.get(key)
+            if current is None or data.get('timestamp', 0) > current.get('timestamp', 0):
+                self.cache[key] = data
+        self._lookup_single.cache_clear()
+
+    @staticmethod
+    def _migrate_legacy_keys(cache: Dict[str, Dict[str, Any]]) -> bool:
+        """Rehash entries stored under legacy MD5 keys; return whether any were found."""
+        legacy_keys = [
+            key for key, data in cache.items()
+            if len(key) == _LEGACY_KEY_LENGTH and isinstance(data, dict) and 'original' in data
+        ]
+        for key in legacy_keys:
+            data = cache.pop(key)
+            cache.setdefault(_cache_key(data['original']), data)
+        return bool(legacy_keys)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock on the cache files while writing."""
+        with open(self.tag_lock_file, 'ab') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _write_snapshot(self) -> None:
+        """Atomically replace the snapshot file and truncate the journal; caller holds the lock."""
+        # Write to a temp file and swap it in, so a crash mid-write never leaves a truncated snapshot
+        temp_path = f"{self.tag_cache_file}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(jsonutil.dumps(self.cache))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.tag_cache_file)
+        if os.path.exists(self.tag_log_file):
+            os.remove(self.tag_log_file)
 
     def _save_cache(self) -> None:
-        """Save tag translation cache to file."""
+        """Save a full snapshot of the tag translation cache and truncate the journal."""
         try:
-            with open(self.tag_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            with self._write_lock():
+                self._merge_disk_state()
+                self._write_snapshot()
         except Exception as e:
             print(f"Failed to save tag cache: {e}")
 
+    def compact(self) -> None:
+        """Fold the journal into the snapshot file."""
+        self._save_cache()
+
+    def _append_log(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Append cache entries to the journal, compacting once it outgrows the snapshot."""
+        lines = b"".join(
+            jsonutil.dumps({'k': key, 'o': data['original'], 't': data['translation'], 'ts': data['timestamp']}) + b"\n"
+            for key, data in entries.items()
+        )
+        try:
+            with self._write_lock():
+                with open(self.tag_log_file, 'ab') as f:
+                    f.write(lines)
+                snapshot_size = os.path.getsize(self.tag_cache_file) if os.path.exists(self.tag_cache_file) else 0
+                if os.path.getsize(self.tag_log_file) > snapshot_size:
+                    self._merge_disk_state()
+                    self._write_snapshot()
+        except Exception as e:
+            print(f"Failed to save tag cache: {e}")
+
+    def _lookup(self, tag: str) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a tag, or None if missing."""
+        return self.cache.get(_cache_key(tag))
+
     def get_translations(self, tags: List[str]) -> Dict[str, str]:
         """Get translations for the given tags from cache."""
-        translations = {}
+        return self.partition(tags)[0]
+
+    def partition(self, tags: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """Split tags into cached translations and tags still needing translation, in one pass."""
+        lookup = self._lookup_single
+        # Check if cache is not too old (30 days), against one cutoff for the whole batch
+        cutoff = self._cutoff()
+        cached = {}
+        uncached = []
         for tag in tags:
-            # Create cache key from tag
-            cache_key = hashlib.md5(tag.lower().encode()).hexdigest()
-            if cache_key in self.cache:
-                cached_data = self.cache[cache_key]
-                # Check if cache is not too old (30 days)
-                if self._is_recent(cached_data.get('timestamp', 0)):
-                    translations[tag] = cached_data['translation']
-        return translations
+            cached_data = lookup(tag)
+            if cached_data is not None and self._is_recent(cached_data.get('timestamp', 0), cutoff):
+                cached[tag] = cached_data['translation']
+            else:
+                uncached.append(tag)
+        return cached, uncached
 
     def set_translations(self, tag_translations: Dict[str, str]) -> None:
         """Store translations in cache."""
-        timestamp = datetime.now().timestamp()
-        for tag, translation in tag_translations.items():
-            cache_key = hashlib.md5(tag.lower().encode()).hexdigest()
-            self.cache[cache_key] = {
+        timestamp = time.time()
+        entries = {
+            _cache_key(tag): {
                 'original': tag,
                 'translation': translation,
                 'timestamp': timestamp
             }
-        self._save_cache()
+            for tag, translation in tag_translations.items()
+        }
+        self.cache.update(entries)
+        self._lookup_single.cache_clear()
+        self._append_log(entries)
+
+    @staticmethod
+    def _cutoff(days: int = 30) -> float:
+        """Epoch timestamp before which entries are considered stale."""
+        return time.time() - days * _DAY_SECONDS
 
-    def _is_recent(self, timestamp: float, days: int = 30) -> bool:
-        """Check if timestamp is within the specified number of days."""
-        cache_time = datetime.fromtimestamp(timestamp)
-        return datetime.now() - cache_time < timedelta(days=days)
+    @staticmethod
+    def _is_recent(timestamp: float, cutoff: float) -> bool:
+        """Check if timestamp is not older than the precomputed cutoff."""
+        return timestamp >= cutoff
 
     def get_uncached_tags(self, tags: List[str]) -> List[str]:
         """Get list of tags that are not in cache."""
-        cached = self.get_translations(tags)
-        return [tag for tag in tags if tag not in cached]
+        return self.partition(tags)[1]
 
     def clear_old_cache(self, days: int = 30) -> int:
         """Clear cache entries older than specified days."""
+        cutoff = self._cutoff(days)
         cleared = 0
-        current_time = datetime.now().timestamp()
-        max_age = timedelta(days=days).total_seconds()
-
-        keys_to_remove = []
-        for key, data in self.cache.items():
-            if current_time - data.get('timestamp', 0) > max_age:
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            del self.cache[key]
-            cleared += 1
 
-        if cleared > 0:
-            self._save_cache()
+        try:
+            with self._write_lock():
+                # Prune after folding in other processes' entries, so the rewrite loses nothing recent
+                self._merge_disk_state()
+                # Rebuild in one pass rather than collecting keys and deleting them
+                old_size = len(self.cache)
+                self.cache = {
+                    key: data for key, data in self.cache.items()
+                    if self._is_recent(data.get('timestamp', 0), cutoff)
+                }
+                cleared = old_size - len(self.cache)
+                if cleared > 0:
+                    self._lookup_single.cache_clear()
+                    self._write_snapshot()
+        except Exception as e:
+            print(f"Failed to save tag cache: {e}")
 
         return cleared
@@ -1,23 +1,118 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import requests
 import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .tag_cache import TagCacheManager
 
+# Upper bound on concurrent LLM requests per translate_metadata call
+TRANSLATE_WORKERS = 8
+# Maximum number of texts packed into a single batched translation prompt
+TRANSLATE_BATCH_SIZE = 50
+# Maximum number of tags sent to the LLM in one batched request
+TAG_BATCH_SIZE = 32
+# Number of translated texts remembered by each LLMTranslator
+TEXT_MEMO_SIZE = 8192
+# How long a reachability probe of the LLM endpoint is trusted, and how long the probe may take
+LLM_HEALTH_TTL = 60
+LLM_PROBE_TIMEOUT = 2
+
+
+def _extract_translations(content: str) -> Optional[list]:
+    """Parse a JSON array, or an object with a "translations" array, out of a model reply."""
+    for start, end in (('{', '}'), ('[', ']')):
+        try:
+            parsed = json.loads(content[content.find(start):content.rfind(end) + 1])
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            parsed = parsed.get("translations")
+        if isinstance(parsed, list):
+            return parsed
+    return None
+
+
+# CJK Unified Ideographs, and Japanese kana which rule out treating kanji-heavy text as Chinese
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_KANA_RE = re.compile(r'[\u3040-\u30ff]')
+# Share of ideographs above which a text is taken to be Chinese already
+_CHINESE_RATIO = 0.3
+
+
+def _needs_translation(text: str) -> bool:
+    """Whether text has content and is not already Chinese."""
+    stripped = text.strip()
+    if not stripped:
+        return False
+    if _KANA_RE.search(stripped):
+        return True
+    return len(_CJK_RE.findall(stripped)) / len(stripped) <= _CHINESE_RATIO
+
+
+def _memo_key(text: str) -> str:
+    """Normalize whitespace so reflowed copies of the same text share a memo entry."""
+    return " ".join(text.split())
+
+
+def _create_session(proxy: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Create an LLM API session with a keep-alive pool sized for concurrent translation calls."""
+    session = requests.Session()
+    # urllib3's default allowed methods exclude POST, so a slow completion is never re-sent;
+    # completions are only retried on connection errors, before the request reached the server
+    retry = Retry(total=2, backoff_factor=0.2, backoff_max=30, backoff_jitter=0.2,
+                  status_forcelist=[429, 502, 503, 504],
+                  respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=TRANSLATE_WORKERS * 2, pool_maxsize=TRANSLATE_WORKERS * 2, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if proxy:
+        session.proxies.update(proxy)
+    return session
+
 
 class LLMTranslator:
     """LLM-based translator using local model."""
 
-    def __init__(self, model_config: Dict[str, Any], proxy: Optional[Dict[str, str]] = None):
+    def __init__(self, model_config: Dict[str, Any], proxy: Optional[Dict[str, str]] = None,
+                 tag_translator: Optional["TagTranslator"] = None):
         self.model_config = model_config
         self.proxy = proxy
+        # Genres and keywords go through the cached tag path when available
+        self.tag_translator = tag_translator
         self.base_url = model_config.get("base_url", "http://127.0.0.1:32668/v1")
         self.api_key = model_config.get("api_key", "EMPTY")
         self.model = model_config.get("model", "local-4b")
-        self.session = requests.Session()
-        if proxy:
-            self.session.proxies.update(proxy)
-
-    def _call_llm(self, prompt: str) -> str:
+        self._endpoint = f"{self.base_url}/chat/completions"
+        self._headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key != "EMPTY" else {}
+        self.session = _create_session(proxy)
+        # Exact-match LRU of successful translations: normalized text -> translation
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def _memo_get(self, key: str) -> Optional[str]:
+        """Return a remembered translation, marking it most recently used."""
+        with self._memo_lock:
+            translated = self._memo.get(key)
+            if translated is not None:
+                self._memo.move_to_end(key)
+            return translated
+
+    def _remember(self, text: str, translated: str) -> None:
+        """Remember a successful translation, evicting the least recently used entry when full."""
+        if not translated or translated == text:
+            return
+        with self._memo_lock:
+            self._memo[_memo_key(text)] = translated
+            self._memo.move_to_end(_memo_key(text))
+            if len(self._memo) > TEXT_MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _call_llm(self, prompt: str, max_tokens: int = 1000, json_mode: bool = False) -> str:
         """Call LLM API for translation."""
         try:
             payload = {
@@ -27,15 +122,16 @@ class LLMTranslator:
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.1,
-                "max_tokens": 1000
+                "max_tokens": max_tokens
             }
-
-            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key != "EMPTY" else {}
+            if json_mode:
+                # Honoured by OpenAI-compatible servers such as vLLM
+                payload["response_format"] = {"type": "json_object"}
 
             response = self.session.post(
-                f"{self.base_url}/chat/completions",
+                self._endpoint,
                 json=payload,
-                headers=headers,
+                headers=self._headers,
                 timeout=60
             )
             response.raise_for_status()
@@ -48,11 +144,16 @@ class LLMTranslator:
 
     def translate_text(self, text: str) -> str:
         """Translate a single text to Chinese."""
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, str) or not _needs_translation(text):
             return text
 
+        cached = self._memo_get(_memo_key(text))
+        if cached is not None:
+            return cached
+
         try:
             translated = self._call_llm(f"Translate to Chinese: {text}")
+            self._remember(text, translated)
             return translated if translated else text
         except Exception:
             return text
@@ -62,55 +163,151 @@ class LLMTranslator:
         if not keywords or not isinstance(keywords, list):
             return keywords
 
+        # Only send keywords that are not Chinese already
+        pending = [keyword for keyword in keywords if isinstance(keyword, str) and _needs_translation(keyword)]
+        if not pending:
+            return keywords
+
+        keywords_json = json.dumps(pending, ensure_ascii=False)
+        prompts = (
+            (f"Translate these keywords/tags to Chinese. Return only a JSON array of the same length, "
+             f"in the same order:\n{keywords_json}", False),
+            # One retry in the server's JSON mode, which only emits objects
+            (f"Translate these keywords/tags to Chinese. Return only a JSON object with a \"translations\" "
+             f"array of the same length, in the same order:\n{keywords_json}", True),
+        )
         try:
-            keywords_text = ", ".join(keywords)
-            translated_text = self._call_llm(f"Translate these keywords/tags to Chinese, keep them as comma-separated list: {keywords_text}")
-            if translated_text:
-                # Split back into list
-                translated_keywords = [tag.strip() for tag in translated_text.split(",") if tag.strip()]
+            for prompt, json_mode in prompts:
+                translated_text = self._call_llm(prompt, json_mode=json_mode)
+                if not translated_text:
+                    break
+                translated_keywords = _extract_translations(translated_text)
                 # If translation failed or returned wrong number, keep original
-                if len(translated_keywords) == len(keywords):
-                    return translated_keywords
+                if translated_keywords is not None and len(translated_keywords) == len(pending):
+                    translations = {
+                        keyword: str(tag).strip() or keyword
+                        for keyword, tag in zip(pending, translated_keywords)
+                    }
+                    return [translations.get(keyword, keyword) for keyword in keywords]
             return keywords
         except Exception:
             return keywords
 
-    def translate_metadata(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Translate metadata fields to Chinese."""
-        translated_data = data.copy()
+    def translate_texts(self, texts: List[str]) -> List[str]:
+        """Translate many texts with as few LLM calls as possible, preserving order."""
+        results = list(texts)
+
+        # Serve remembered texts directly and translate each distinct remaining text once
+        pending = {}
+        for i, text in enumerate(texts):
+            if not text or not isinstance(text, str) or not _needs_translation(text):
+                continue
+            key = _memo_key(text)
+            cached = self._memo_get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
 
-        # Translate title
-        if 'title' in data and not data.get('title_zh'):
-            translated_data['title_zh'] = self.translate_text(data['title'])
+        groups = list(pending.values())
+        chunks = [groups[i:i + TRANSLATE_BATCH_SIZE] for i in range(0, len(groups), TRANSLATE_BATCH_SIZE)]
 
-        # Translate plot
-        if 'plot' in data and not data.get('plot_zh'):
-            translated_data['plot_zh'] = self.translate_text(data['plot'])
+        def translate_chunk(chunk_groups: List[List[int]]) -> List[str]:
+            chunk = [texts[positions[0]] for positions in chunk_groups]
+            return self._translate_batch(chunk) if len(chunk) > 1 else [self.translate_text(chunk[0])]
 
-        # Translate tagline
-        if 'tagline' in data and not data.get('tagline_zh'):
-            translated_data['tagline_zh'] = self.translate_text(data['tagline'])
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(TRANSLATE_WORKERS, len(chunks))) as executor:
+                translated_chunks = list(executor.map(translate_chunk, chunks))
+        else:
+            translated_chunks = [translate_chunk(chunk) for chunk in chunks]
+
+        for chunk_groups, translated in zip(chunks, translated_chunks):
+            for positions, value in zip(chunk_groups, translated):
+                self._remember(texts[positions[0]], value)
+                for i in positions:
+                    results[i] = value
+        return results
+
+    def _translate_batch(self, texts: List[str]) -> List[str]:
+        """Translate a chunk of texts with a single JSON-structured LLM call."""
+        prompt = (
+            "Translate the following texts to Chinese. Return only a JSON object with a "
+            '"translations" array holding exactly one entry per input, in the same order:\n'
+            + json.dumps(texts, ensure_ascii=False)
+        )
+        content = self._call_llm(prompt, max_tokens=max(1000, 2 * sum(map(len, texts))))
+        if not content:
+            return texts
+
+        translations = _extract_translations(content)
+        if translations is None or len(translations) != len(texts):
+            # Model ignored the JSON contract; fall back to one call per text
+            return [self.translate_text(text) for text in texts]
+
+        return [
+            translated.strip() if isinstance(translated, str) and translated.strip() else text
+            for text, translated in zip(texts, translations)
+        ]
 
-        # Translate genres
+    def translate_metadata(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate metadata fields to Chinese, batching all texts into as few LLM calls as possible."""
+        translated_data = data.copy()
+
+        # Collect every (field, text) pair first so they share one prompt
+        fields = [
+            field for field in ('title', 'plot', 'tagline')
+            if field in data and not data.get(f'{field}_zh')
+        ]
+        texts = [data[field] for field in fields]
+
+        genres = None
         if 'genres' in data and not data.get('genres_zh'):
             # Genres are typically list of strings
-            if isinstance(data['genres'], list):
-                translated_genres = []
-                for genre in data['genres']:
-                    translated_genres.append(self.translate_text(genre))
-                translated_data['genres_zh'] = translated_genres
-            else:
-                translated_data['genres_zh'] = self.translate_text(str(data['genres']))
+            genres = data['genres'] if isinstance(data['genres'], list) else [str(data['genres'])]
 
-        # Translate keywords/tags
+        keywords = None
         if 'keywords' in data and not data.get('keywords_zh'):
-            translated_data['keywords_zh'] = self.translate_keywords(data['keywords'])
+            keywords = data['keywords']
+
+        tag_map = None
+        if self.tag_translator:
+            # Genres and keywords share one cached, deduplicated tag batch
+            tags = list(genres or ())
+            if keywords and isinstance(keywords, list):
+                tags.extend(keywords)
+            tag_map = self.tag_translator.translate_tag_map(tags) if tags else {}
+        elif genres is not None:
+            texts.extend(genres)
 
         # Ensure cast has name_zh
-        if 'cast' in translated_data:
-            for actor in translated_data['cast']:
-                if 'name_en' in actor and not actor.get('name_zh'):
-                    actor['name_zh'] = self.translate_text(actor['name_en'])
+        actors = [
+            actor for actor in translated_data.get('cast') or ()
+            if 'name_en' in actor and not actor.get('name_zh')
+        ]
+        texts.extend(actor['name_en'] for actor in actors)
+
+        results = iter(self.translate_texts(texts))
+
+        for field in fields:
+            translated_data[f'{field}_zh'] = next(results)
+
+        if genres is not None:
+            if tag_map is not None:
+                translated_genres = [tag_map.get(genre, genre) for genre in genres]
+            else:
+                translated_genres = [next(results) for _ in genres]
+            translated_data['genres_zh'] = translated_genres if isinstance(data['genres'], list) else translated_genres[0]
+
+        for actor in actors:
+            actor['name_zh'] = next(results)
+
+        # Translate keywords/tags
+        if 'keywords' in data and not data.get('keywords_zh'):
+            if tag_map is not None and keywords and isinstance(keywords, list):
+                translated_data['keywords_zh'] = [tag_map.get(keyword, keyword) for keyword in keywords]
+            else:
+                translated_data['keywords_zh'] = self.translate_keywords(keywords)
 
         return translated_data
 
@@ -118,16 +315,47 @@ class LLMTranslator:
 class SimpleTranslator:
     """Simple translator that ensures Chinese fields exist - fallback when LLM unavailable."""
 
-    def __init__(self, model_config: Dict[str, Any], proxy: Optional[Dict[str, str]] = None):
+    # Probe results shared across instances: base_url -> (checked_at, reachable)
+    _health: Dict[str, Tuple[float, bool]] = {}
+
+    def __init__(self, model_config: Dict[str, Any], proxy: Optional[Dict[str, str]] = None,
+                 tag_translator: Optional["TagTranslator"] = None):
         # Try to use LLM translator first
         try:
-            self.translator = LLMTranslator(model_config, proxy)
+            self.translator = LLMTranslator(model_config, proxy, tag_translator)
         except Exception:
             self.translator = None
 
+    def _llm_available(self) -> bool:
+        """Probe the LLM endpoint once per LLM_HEALTH_TTL so a down server doesn't cost a timeout per call."""
+        translator = self.translator
+        if translator is None:
+            return False
+
+        now = time.monotonic()
+        cached = SimpleTranslator._health.get(translator.base_url)
+        if cached is not None and now - cached[0] < LLM_HEALTH_TTL:
+            return cached[1]
+
+        try:
+            response = translator.session.get(
+                f"{translator.base_url}/models",
+                headers=translator._headers,
+                timeout=LLM_PROBE_TIMEOUT
+            )
+            # Any non-server-error answer means the model server is up
+            reachable = response.status_code < 500
+        except requests.RequestException:
+            reachable = False
+
+        if not reachable:
+            print(f"LLM endpoint {translator.base_url} is unreachable, skipping translation")
+        SimpleTranslator._health[translator.base_url] = (now, reachable)
+        return reachable
+
     def translate_metadata(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure Chinese fields exist, use LLM if available, fallback to English if needed."""
-        if self.translator:
+        if self._llm_available():
             return self.translator.translate_metadata(data)
 
         # Fallback to simple copy
@@ -170,9 +398,9 @@ Your task is to translate English tags/keywords to Chinese. You must return the
 Each translation should be accurate, natural, and commonly used in Chinese media contexts.
 
 Rules:
-- Return only the translated tags, one per line
+- Return only a JSON object of the form {"translations": [...]}, one string per input tag, in input order
 - Do not add any explanations, comments, or extra text
-- Maintain the exact same number of output lines as input
+- Maintain the exact same number of translations as input tags
 - Use simplified Chinese characters
 - Keep technical terms appropriately translated"""
 
@@ -182,9 +410,9 @@ Rules:
         self.base_url = model_config.get("base_url", "http://127.0.0.1:32668/v1")
         self.api_key = model_config.get("api_key", "EMPTY")
         self.model = model_config.get("model", "local-4b")
-        self.session = requests.Session()
-        if proxy:
-            self.session.proxies.update(proxy)
+        self._endpoint = f"{self.base_url}/chat/completions"
+        self._headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key != "EMPTY" else {}
+        self.session = _create_session(proxy)
         self.cache = TagCacheManager()
 
     def translate_tags(self, tags: List[str], enable_cache: bool = True) -> List[str]:
@@ -201,36 +429,51 @@ Rules:
         if not tags:
             return []
 
+        translations = self.translate_tag_map(tags, enable_cache)
+        return list(translations.values())
+
+    def translate_tag_map(self, tags: List[str], enable_cache: bool = True) -> Dict[str, str]:
+        """
+        Translate tags to Chinese and return an ordered mapping of unique tag to translation.
+
+        Args:
+            tags: List of tags to translate
+            enable_cache: Whether to use cache (default: True)
+
+        Returns:
+            Dict from each unique, non-empty tag (first-seen order) to its translation
+        """
         # Remove duplicates while preserving order
-        unique_tags = []
-        seen = set()
-        for tag in tags:
-            if tag and tag not in seen:
-                unique_tags.append(tag)
-                seen.add(tag)
+        unique_tags = list(dict.fromkeys(tag for tag in tags if tag))
 
         if enable_cache:
-            # Get cached translations
-            cached_translations = self.cache.get_translations(unique_tags)
-
-            # Get uncached tags
-            uncached_tags = [tag for tag in unique_tags if tag not in cached_translations]
+            # Split into cached translations and tags still to translate
+            cached_translations, uncached_tags = self.cache.partition(unique_tags)
         else:
             cached_translations = {}
             uncached_tags = unique_tags
 
+        # Tags that are already Chinese translate to themselves
+        uncached_tags = [tag for tag in uncached_tags if _needs_translation(tag)]
+
         # Translate uncached tags
         new_translations = {}
         if uncached_tags:
+            # Moderate shards keep each prompt within context limits and run concurrently
+            shards = [uncached_tags[i:i + TAG_BATCH_SIZE] for i in range(0, len(uncached_tags), TAG_BATCH_SIZE)]
             try:
-                translated_list = self._translate_tags_batch(uncached_tags)
-                if len(translated_list) == len(uncached_tags):
-                    for original, translated in zip(uncached_tags, translated_list):
-                        new_translations[original] = translated
+                if len(shards) > 1:
+                    with ThreadPoolExecutor(max_workers=min(TRANSLATE_WORKERS, len(shards))) as executor:
+                        translated_shards = list(executor.map(self._translate_tags_batch, shards))
                 else:
-                    # If translation failed, use original tags
-                    for tag in uncached_tags:
-                        new_translations[tag] = tag
+                    translated_shards = [self._translate_tags_batch(shards[0])]
+
+                for shard, translated_list in zip(shards, translated_shards):
+                    if len(translated_list) == len(shard):
+                        new_translations.update(zip(shard, translated_list))
+                    else:
+                        # If translation failed, use original tags
+                        new_translations.update((tag, tag) for tag in shard)
             except Exception as e:
                 print(f"Tag translation failed: {e}")
                 # Use original tags as fallback
@@ -241,31 +484,20 @@ Rules:
             if enable_cache and new_translations:
                 self.cache.set_translations(new_translations)
 
-        # Combine cached and new translations
-        result = []
-        for tag in unique_tags:
-            if tag in cached_translations:
-                result.append(cached_translations[tag])
-            elif tag in new_translations:
-                result.append(new_translations[tag])
-            else:
-                result.append(tag)  # Fallback
-
-        return result
+        # Combine cached and new translations, falling back to the original tag
+        translations = {**new_translations, **cached_translations}
+        return {tag: translations.get(tag, tag) for tag in unique_tags}
 
     def _translate_tags_batch(self, tags: List[str]) -> List[str]:
         """Translate a batch of tags using LLM."""
         if not tags:
             return []
 
-        # Prepare input
-        tags_text = "\n".join(tags)
-
-        user_prompt = f"""Translate these tags to Chinese:
-
-{tags_text}
-
-Return one translated tag per line:"""
+        user_prompt = (
+            "Translate these tags to Chinese. Return only a JSON object with a \"translations\" "
+            "array of the same length, in the same order:\n\n"
+            + json.dumps(tags, ensure_ascii=False)
+        )
 
         try:
             payload = {
@@ -275,15 +507,15 @@ Return one translated tag per line:"""
                     {"role": "user", "content": user_prompt}
                 ],
                 "temperature": 0.1,
-                "max_tokens": len(tags) * 50  # Estimate tokens needed
+                "max_tokens": len(tags) * 50,  # Estimate tokens needed
+                # Honoured by OpenAI-compatible servers such as vLLM
+                "response_format": {"type": "json_object"}
             }
 
-            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key != "EMPTY" else {}
-
             response = self.session.post(
-                f"{self.base_url}/chat/completions",
+                self._endpoint,
                 json=payload,
-                headers=headers,
+                headers=self._headers,
                 timeout=120  # Longer timeout for batch translation
             )
             response.raise_for_status()
@@ -291,15 +523,19 @@ Return one translated tag per line:"""
             result = response.json()
             translated_text = result["choices"][0]["message"]["content"].strip()
 
-            # Parse the response - split by lines
-            translated_lines = [line.strip() for line in translated_text.split('\n') if line.strip()]
+            # Parse the JSON response
+            translations = _extract_translations(translated_text)
 
             # Ensure we have the same number of translations
-            if len(translated_lines) == len(tags):
-                return translated_lines
+            if translations is not None and len(translations) == len(tags):
+                return [
+                    str(translated).strip() or tag
+                    for tag, translated in zip(tags, translations)
+                ]
             else:
                 # If parsing failed, return original tags
-                print(f"Translation parsing failed: expected {len(tags)} translations, got {len(translated_lines)}")
+                got = "unparseable output" if translations is None else f"{len(translations)} translations"
+                print(f"Translation parsing failed: expected {len(tags)} translations, got {got}")
                 return tags
 
         except Exception as e: